@@ -0,0 +1,150 @@
+import random
+
+
+SIZES = {
+    '1k': 1000,
+    '100k': 100 * 1000,
+    '1m': 1000 * 1000,
+}
+
+_FIRST_NAMES = [
+    "Anna", "Piotr", "John", "Mar{\\'\\i}a", "J\\\"{u}rgen", "Fran\\c{c}ois",
+    "Zo{\\'e}", "Li", "Hiroshi", "Ewa", "S{\\o}ren", "Ana", "Paul",
+    "Ji{\\v{r}}{\\'\\i}",
+]
+_LAST_NAMES = [
+    "Smith", "Kowalski", "M{\\\"u}ller", "Garc{\\'\\i}a", "Nowak", "Dubois",
+    "Tanaka", "Wang", "Ch{\\'e}rif", "Br{\\aa}ten", "Lef{\\`e}vre",
+    "{\\L}ukasiewicz", "Erd{\\H{o}}s", "Johnson",
+]
+_PREFIXES = ["von", "van der", "de", "da"]
+_WORDS = [
+    "analysis", "of", "the", "stochastic", "model", "for", "large", "scale",
+    "systems", "with", "applications", "to", "quantum", "networks", "on",
+    "estimation", "in", "nonlinear", "dynamics", "a", "survey", "learning",
+    "optimal", "control", "under", "uncertainty", "and", "its", "limits",
+]
+_MACROS = [
+    "\\alpha", "\\beta", "\\lambda", "\\'{e}", "\\\"{o}", "\\~{n}",
+    "{\\'a}", "\\sigma", "\\pi",
+]
+_ACRONYMS = ["{DNA}", "{GPU}", "{B}ayesian", "{M}arkov", "{\\lambda}{JAZZ}",
+             "{{N}ew {Y}ork}"]
+_JOURNALS = [
+    "Journal of Applied Probability", "Physical Review {L}etters",
+    "Annals of Statistics", "Comptes Rendus de l'Acad{\\'e}mie",
+    "Nature", "IEEE Transactions on Information Theory",
+]
+_PUBLISHERS = ["Springer", "Elsevier", "Wiley", "Cambridge University Press",
+               "Wydawnictwo Naukowe PWN"]
+
+
+def random_author(rng):
+    """Returns a random author name in one of the supported forms."""
+    first = rng.choice(_FIRST_NAMES)
+    last = rng.choice(_LAST_NAMES)
+    form = rng.random()
+
+    if form < 0.15:
+        return "{} {} {}".format(first, rng.choice(_PREFIXES), last)
+    if form < 0.5:
+        return "{}, {}".format(last, first)
+    if form < 0.55:
+        return "{}, Jr, {}".format(last, first)
+    return "{} {}".format(first, last)
+
+
+def random_authors(rng):
+    """Returns a random " and "-separated list of 1 to 30 authors."""
+    count = min(int(rng.expovariate(0.25)) + 1, 30)
+    return " and ".join(random_author(rng) for _ in range(count))
+
+
+def random_title(rng):
+    """Returns a random title with braced words and LaTeX macros."""
+    words = []
+    for _ in range(rng.randint(6, 25)):
+        chance = rng.random()
+        if chance < 0.08:
+            words.append(rng.choice(_ACRONYMS))
+        elif chance < 0.15:
+            words.append(rng.choice(_MACROS))
+        else:
+            words.append(rng.choice(_WORDS))
+
+    title = " ".join(words)
+    return title[0].upper() + title[1:]
+
+
+def random_text(rng, min_words, max_words):
+    """Returns a random paragraph, e.g. an abstract."""
+    words = (rng.choice(_MACROS) if rng.random() < 0.02
+             else rng.choice(_WORDS)
+             for _ in range(rng.randint(min_words, max_words)))
+    return " ".join(words)
+
+
+def random_entry(rng, number):
+    """Returns a random article or book as BibTeX text."""
+    key = "key{:07d}".format(number)
+    year = str(rng.randint(1900, 2025))
+
+    if rng.random() < 0.8:
+        fields = [
+            ("author", random_authors(rng)),
+            ("title", random_title(rng)),
+            ("journal", rng.choice(_JOURNALS)),
+            ("year", year),
+            ("volume", str(rng.randint(1, 120))),
+            ("number", str(rng.randint(1, 12))),
+        ]
+        first_page = rng.randint(1, 2000)
+        fields.append(("pages", "{}--{}".format(
+            first_page, first_page + rng.randint(1, 60))))
+        entry_type = "article"
+    else:
+        fields = [
+            ("author", random_authors(rng)),
+            ("title", random_title(rng)),
+            ("publisher", rng.choice(_PUBLISHERS)),
+            ("year", year),
+            ("address", "Berlin"),
+        ]
+        entry_type = "book"
+
+    # BibTeX has no abstract field, abstracts are kept in annote.
+    if rng.random() < 0.7:
+        fields.append(("annote", random_text(rng, 80, 300)))
+    if rng.random() < 0.5:
+        fields.append(("file", ":/home/user/papers/{}/{}.pdf:PDF".format(
+            year, "_".join(rng.choice(_WORDS) for _ in range(12)))))
+
+    lines = ["@{}{{{},".format(entry_type, key)]
+    lines.extend("  {} = {{{}}},".format(name, value)
+                 for name, value in fields)
+    lines.append("}\n\n")
+
+    return "\n".join(lines)
+
+
+def write_corpus(fp, entries, seed=0):
+    """
+    Writes a random bibliography to a text file object. The same seed
+    always gives the same file.
+
+    Args:
+        fp: A text file object.
+        entries (int): Number of entries.
+        seed (int): Seed of the random generator.
+
+    """
+    rng = random.Random(seed)
+    fp.write("% Encoding: UTF-8\n\n")
+    for number in range(entries):
+        fp.write(random_entry(rng, number))
+
+
+def generate_corpus(filename, entries, seed=0):
+    """Writes a random bibliography of a given size to a file."""
+    with open(filename, "w", encoding="utf-8") as fp:
+        write_corpus(fp, entries, seed)
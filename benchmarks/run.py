@@ -0,0 +1,236 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic.latextouni import LatexToUni
+from bibtexmagic.bibtexmagic.fields.author import AuthorBibTexField
+from bibtexmagic.bibtexmagic.fields.title import TitleBibTexField
+
+from . import corpus
+
+
+RESULTS_VERSION = 1
+
+
+def _clear_caches():
+    """Empties the conversion caches and the table of persons, so that
+    every run starts cold."""
+    BibTexMagic.LATEX_TO_UNICODE_CACHE.clear()
+    BibTexMagic.UNICODE_TO_LATEX_CACHE.clear()
+    BibTexMagic.NAMES.clear()
+
+
+def _samples(count, seed):
+    """Returns count raw author lists and titles as found in a corpus."""
+    rng = random.Random(seed)
+    authors = [corpus.random_authors(rng) for _ in range(count)]
+    titles = [corpus.random_title(rng) for _ in range(count)]
+
+    return authors, titles
+
+
+def _edited_copy(filename):
+    """Returns a copy of a corpus with the title of one entry changed."""
+    edited = filename + ".edited"
+    with open(filename, encoding="utf-8") as bibfile:
+        bib = bibfile.read()
+    with open(edited, "w", encoding="utf-8") as bibfile:
+        bibfile.write(bib.replace("title = {", "title = {Edited ", 1))
+
+    return edited
+
+
+def _benchmarks(filename, entries, seed):
+    """Yields (name, prepare) pairs of the benchmarks. Calling prepare
+    sets up a benchmark and returns the function to be timed, so that
+    the benchmarks which are not run are not set up either."""
+    def parse_bib():
+        return lambda: BibTexMagic().parse_bib(filename)
+
+    def to_bibtex():
+        parser = BibTexMagic()
+        parser.parse_bib(filename)
+        return parser.to_bibtex
+
+    def reparse_one_edit():
+        # Every run reparses the corpus with a single entry changed back
+        # and forth, which only parses that entry but still scans the
+        # whole file.
+        parser = BibTexMagic(track_changes=True)
+        parser.parse_bib(filename)
+        files = itertools.cycle([_edited_copy(filename), filename])
+        return lambda: parser.reparse(next(files))
+
+    def latex_to_unicode():
+        authors, titles = _samples(entries, seed)
+        converter = LatexToUni()
+        latex = authors + titles
+        return lambda: [converter.lat_to_uni(s) for s in latex]
+
+    def unicode_to_latex():
+        authors, titles = _samples(entries, seed)
+        converter = LatexToUni()
+        unicode = [converter.lat_to_uni(s) for s in authors + titles]
+        return lambda: [converter.uni_to_lat(s) for s in unicode]
+
+    def author_field():
+        authors, _ = _samples(entries, seed)
+        return lambda: [AuthorBibTexField(raw) for raw in authors]
+
+    def title_field():
+        _, titles = _samples(entries, seed)
+        return lambda: [TitleBibTexField(raw) for raw in titles]
+
+    for prepare in (parse_bib, to_bibtex, reparse_one_edit,
+                    latex_to_unicode, unicode_to_latex, author_field,
+                    title_field):
+        yield prepare.__name__, prepare
+
+
+def run_benchmarks(filename, entries, seed=0, repeat=3, only=None):
+    """
+    Times the parser on a corpus file.
+
+    Every benchmark is run repeat times with cold conversion caches and
+    the fastest run is reported, as slower runs measure the noise of
+    the machine rather than the code.
+
+    Args:
+        filename (str): Corpus written by corpus.generate_corpus.
+        entries (int): Number of entries in the corpus.
+        seed (int): Seed the corpus was generated with.
+        repeat (int): Number of runs of every benchmark.
+        only (list): Names of the benchmarks to be run, or None for all.
+
+    Returns:
+        dict: {name: {"seconds": fastest, "runs": [...]}}
+
+    """
+    results = {}
+    for name, prepare in _benchmarks(filename, entries, seed):
+        if only is not None and name not in only:
+            continue
+
+        function = prepare()
+        runs = []
+        for _ in range(repeat):
+            _clear_caches()
+            start = time.perf_counter()
+            function()
+            runs.append(time.perf_counter() - start)
+
+        results[name] = {"seconds": min(runs), "runs": runs}
+
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Finds the benchmarks which got slower than in a baseline.
+
+    Args:
+        results (dict): Results as returned by run_benchmarks.
+        baseline (dict): Stored results of the same benchmarks.
+        threshold (float): Allowed relative slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        list: (name, baseline seconds, seconds, ratio) tuples of the
+            regressed benchmarks.
+
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        before = baseline[name]["seconds"]
+        after = result["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((name, before, after, ratio))
+
+    return regressions
+
+
+def _corpus_file(corpus_dir, size, seed):
+    """Returns the corpus of a given size, generating it if needed."""
+    filename = os.path.join(corpus_dir, f"corpus-{size}-{seed}.bib")
+    if not os.path.exists(filename):
+        os.makedirs(corpus_dir, exist_ok=True)
+        tmp_filename = filename + ".tmp"
+        corpus.generate_corpus(tmp_filename, corpus.SIZES[size], seed)
+        os.replace(tmp_filename, filename)
+
+    return filename
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line, e.g.
+    python -m bibtexmagic.benchmarks.run --size 100k --output new.json
+    --compare baseline.json"""
+    args = argparse.ArgumentParser(
+        description="Times BibTexMagic on a generated corpus.")
+    args.add_argument("--size", choices=sorted(corpus.SIZES), default="1k")
+    args.add_argument("--seed", type=int, default=0)
+    args.add_argument("--repeat", type=int, default=3)
+    args.add_argument("--only", nargs="+", help="benchmarks to be run")
+    args.add_argument("--corpus-dir",
+                      default=os.path.join(tempfile.gettempdir(),
+                                           "bibtexmagic-benchmarks"),
+                      help="where the generated corpora are kept")
+    args.add_argument("--output", help="JSON file to write the results to")
+    args.add_argument("--compare", metavar="BASELINE",
+                      help="JSON results to check for regressions against")
+    args.add_argument("--threshold", type=float, default=0.1,
+                      help="allowed relative slowdown (default: 0.1)")
+    args = args.parse_args(argv)
+
+    entries = corpus.SIZES[args.size]
+    filename = _corpus_file(args.corpus_dir, args.size, args.seed)
+    results = run_benchmarks(filename, entries, args.seed, args.repeat,
+                             args.only)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "size": args.size,
+        "entries": entries,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:20s} {result['seconds']:10.4f} s")
+
+    if args.output is not None:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+
+    if args.compare is None:
+        return 0
+
+    with open(args.compare) as fp:
+        baseline = json.load(fp)
+    if baseline.get("size") != args.size:
+        print(f"Warning: the baseline is for size {baseline.get('size')}.",
+              file=sys.stderr)
+
+    regressions = compare(results, baseline["results"], args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before:.4f} s -> {after:.4f} s "
+              f"({ratio:.2f}x)")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+from array import array
+
+
+class ColumnTable():
+    """
+    Entries of a bibliography stored column by column.
+
+    Every field has a list of values, one per entry, with None where the
+    entry does not have the field, and a null mask, a bytearray holding
+    1 where it does. Fields naming persons (author, editor) are flattened:
+    the persons of entry i are at positions offsets[i]:offsets[i+1] of
+    the 'last', 'jr' and 'first' lists. Offsets are an int64 array, so
+    that the masks and the offsets are shared with NumPy without copies.
+
+    Members:
+        length (int): Number of entries.
+        columns (dict): Maps 'key', 'entry_type' and the field names to
+            lists of values.
+        masks (dict): Maps the field names to their null masks.
+        names (dict): Maps the person fields to (offsets, last, jr, first)
+            tuples.
+
+    """
+
+    NAME_FIELDS = ('author', 'editor')
+
+    def __init__(self, entries):
+        """
+        Builds the columns in a single pass over the entries.
+
+        Args:
+            entries: An iterable of BibTexEntry objects.
+
+        """
+        keys = []
+        entry_types = []
+        self.columns = {'key': keys, 'entry_type': entry_types}
+        self.masks = {}
+        self.names = {}
+
+        row = 0
+        for entry in entries:
+            keys.append(entry.key)
+            entry_types.append(entry.entry_type)
+
+            for field in entry.fields:
+                if field.name in self.NAME_FIELDS:
+                    self._add_names(row, field)
+                else:
+                    self._add_value(row, field)
+            row += 1
+
+        self.length = row
+        for name in self.masks:
+            self._pad(name, row)
+        for offsets, last, _, _ in self.names.values():
+            offsets.extend([len(last)] * (row + 1 - len(offsets)))
+
+    def _pad(self, name, row):
+        """Fills a column with nulls up to a given row."""
+        values = self.columns[name]
+        missing = row - len(values)
+        if missing > 0:
+            values.extend([None] * missing)
+            self.masks[name].extend(bytes(missing))
+
+    def _add_value(self, row, field):
+        """Stores a field value in its column."""
+        name = field.name
+        if name not in self.columns:
+            self.columns[name] = []
+            self.masks[name] = bytearray()
+
+        self._pad(name, row)
+        if len(self.columns[name]) > row:
+            # Only the first of repeated fields is kept.
+            return
+        self.columns[name].append(field.to_json_value())
+        self.masks[name].append(1)
+
+    def _add_names(self, row, field):
+        """Appends the persons of a field to its flat columns."""
+        names = self.names.get(field.name)
+        if names is None:
+            names = self.names[field.name] = (array('q', [0]), [], [], [])
+        offsets, last, jr, first = names
+
+        # Entries since the previous one with this field have no persons.
+        offsets.extend([len(last)] * (row + 1 - len(offsets)))
+        if len(offsets) > row + 1:
+            return
+
+        for person in field.value:
+            last.append(person[0])
+            jr.append(person[1])
+            first.append(person[2])
+        offsets.append(len(last))
+
+    def to_numpy(self):
+        """
+        Returns the columns as NumPy arrays: values as object arrays,
+        masks as bool arrays and offsets as int64 arrays, the last two
+        sharing the memory of the table. Person fields are stored as
+        'author.offsets', 'author.last', etc.
+
+        Returns:
+            dict: Maps the column names to the arrays.
+
+        """
+        import numpy
+
+        arrays = {}
+        for name, values in self.columns.items():
+            column = numpy.empty(len(values), dtype=object)
+            column[:] = values
+            arrays[name] = column
+        for name, mask in self.masks.items():
+            arrays[name + '.mask'] = numpy.frombuffer(mask, dtype=bool)
+        for name, (offsets, last, jr, first) in self.names.items():
+            arrays[name + '.offsets'] = numpy.frombuffer(offsets,
+                                                         dtype=numpy.int64)
+            for part, values in (('last', last), ('jr', jr),
+                                 ('first', first)):
+                column = numpy.empty(len(values), dtype=object)
+                column[:] = values
+                arrays[name + '.' + part] = column
+
+        return arrays
+
+    def to_pandas(self):
+        """Returns a pandas DataFrame with one row per entry and one column
+        per field, missing values being None. See names_to_pandas for
+        the person fields."""
+        import pandas
+
+        arrays = self.to_numpy()
+        return pandas.DataFrame({name: arrays[name] for name in self.columns},
+                                copy=False)
+
+    def names_to_pandas(self, name='author'):
+        """Returns a pandas DataFrame with one row per person named in
+        a field: the 'row' of its entry, 'last', 'jr' and 'first'."""
+        import numpy
+        import pandas
+
+        arrays = self.to_numpy()
+        offsets = arrays[name + '.offsets']
+        rows = numpy.repeat(numpy.arange(self.length), numpy.diff(offsets))
+
+        return pandas.DataFrame(
+            {'row': rows, 'last': arrays[name + '.last'],
+             'jr': arrays[name + '.jr'], 'first': arrays[name + '.first']},
+            copy=False)
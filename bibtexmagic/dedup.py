@@ -0,0 +1,156 @@
+from collections import namedtuple
+
+from .helper import fold_words
+
+
+Cluster = namedtuple('Cluster', ['entries', 'pairs'])
+Cluster.__doc__ = """A group of entries found to describe the same work.
+
+    entries: The entries, in the order of the bibliography.
+    pairs: (entry, entry, score) tuples of the matching pairs which
+        joined the cluster, scores ranging from 0 to 1.
+
+"""
+
+# Words ignored in the blocking keys of titles.
+_STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with'])
+
+# Number of leading title words in the blocking keys.
+_TITLE_KEY_WORDS = 3
+
+
+def normalize(text):
+    """Returns the words of a folded text, see helper.fold_words."""
+    return fold_words(text)
+
+
+class _Signature():
+    """The normalised title, year and first author of an entry."""
+
+    __slots__ = ('entry', 'words', 'year', 'author', 'keys')
+
+    def __init__(self, entry, words, year, author):
+        """Computes the blocking keys of an entry."""
+        self.entry = entry
+        self.words = frozenset(words)
+        self.year = year
+        self.author = author
+
+        # Any of the three parts may differ between duplicates, so every
+        # entry is put in one block per pair of parts.
+        title = " ".join([w for w in words
+                          if w not in _STOP_WORDS][:_TITLE_KEY_WORDS])
+        self.keys = (('ya', year, author), ('at', author, title),
+                     ('yt', year, title))
+
+
+def _signature(entry):
+    """Returns the signature of an entry, or None if it has no title."""
+    title = entry.get_field('title')
+    if title is None:
+        return None
+
+    words = normalize(title.value)
+    if not words:
+        return None
+
+    year = entry.get_field('year')
+    year = year.value.strip() if year is not None else ""
+
+    author = ""
+    names = entry.get_field('author') or entry.get_field('editor')
+    if names is not None and names.value:
+        last = normalize(names.value[0][0])
+        if last:
+            author = last[-1]
+
+    return _Signature(entry, words, year, author)
+
+
+def similarity(a, b):
+    """Scores the similarity of two signatures from 0 to 1: the Jaccard
+    index of the title words weighs 70%, a matching year and first author
+    15% each."""
+    score = 0.7 * len(a.words & b.words) / len(a.words | b.words)
+    if a.year == b.year:
+        score += 0.15
+    if a.author == b.author:
+        score += 0.15
+
+    return score
+
+
+def find_duplicates(entries, threshold=0.85, max_block_size=200):
+    """
+    Groups the entries which look like the same work.
+
+    Entries are put in blocks sharing their year and first author, their
+    first author and the leading words of their title, or their year and
+    the leading words of their title, all normalised as in normalize.
+    Only the entries in the same block are compared, and matching pairs
+    are then joined into clusters. Entries without a title are skipped.
+
+    Args:
+        entries (list): BibTexEntry objects.
+        threshold (float): Minimal similarity of a matching pair.
+        max_block_size (int): Larger blocks, e.g. a very common name in
+            a given year, are not compared as a whole, their entries are
+            still compared within their other blocks.
+
+    Returns:
+        list: Cluster objects of at least two entries, in the order of
+            their first entries.
+
+    """
+    signatures = []
+    blocks = {}
+    for entry in entries:
+        signature = _signature(entry)
+        if signature is None:
+            continue
+
+        number = len(signatures)
+        signatures.append(signature)
+        for key in signature.keys:
+            blocks.setdefault(key, []).append(number)
+
+    parents = list(range(len(signatures)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    pairs = {}
+    for block in blocks.values():
+        if len(block) < 2 or len(block) > max_block_size:
+            continue
+
+        for n, i in enumerate(block):
+            a = signatures[i]
+            for j in block[(n+1):]:
+                if (i, j) in pairs:
+                    continue
+
+                score = similarity(a, signatures[j])
+                if score >= threshold:
+                    pairs[i, j] = score
+                    root_i, root_j = find(i), find(j)
+                    if root_i != root_j:
+                        parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    matches = {}
+    for i, j in sorted(pairs):
+        matches.setdefault(find(i), []).append(
+            (signatures[i].entry, signatures[j].entry, pairs[i, j]))
+
+    members = {}
+    for i, signature in enumerate(signatures):
+        root = find(i)
+        if root in matches:
+            members.setdefault(root, []).append(signature.entry)
+
+    return [Cluster(members[root], matches[root])
+            for root in sorted(matches)]
@@ -1,19 +1,22 @@
 from .field import BibTexField
-from ..bibtexmagic import BibTexMagic
+from .person import NAMES
+from ..latextouni import latex_to_unicode
 
 
 class AuthorBibTexField(BibTexField):
     """Class representing the Author field."""
 
-    def __init__(self, field_raw):
+    __slots__ = ()
+
+    def __init__(self, field_raw, lazy=False):
         """Initialises and parses the field.
 
         Args:
             field_raw (str): Raw BibTex string as seen in a BibTeX file.
+            lazy (bool): If True, the field is parsed on first access.
 
         """
-        self.name = "author"
-        self.value = self.parse_field(field_raw)
+        super().__init__("author", field_raw, lazy)
 
     def parse_field(self, field_raw):
         """Parses the field.
@@ -27,17 +30,27 @@ class AuthorBibTexField(BibTexField):
             field_raw (str): Raw BibTex string as seen in a BibTeX file.
 
         Returns:
-            list: A list of triplets of the form (von Last, Jr, First).
+            tuple: Person objects, i.e. (von Last, Jr, First) triplets,
+                shared through the NAMES table.
 
         """
-        field_raw = BibTexMagic.latex_to_unicode(field_raw)
-
-        author_list = field_raw.split(" and ")
-
-        for i, author in enumerate(author_list):
-            author_list[i] = self._parse_author_name(author)
-
-        return author_list
+        # Names are looked up one by one, as they repeat across entries
+        # much more often than whole author lists.
+        parse = self._parse_raw_name
+        return tuple(NAMES.person(author, parse)
+                     for author in field_raw.split(" and "))
+
+    def __setstate__(self, state):
+        """Restores the field, sharing its persons through the NAMES
+        table as if it had been parsed here."""
+        name, value = state
+        super().__setstate__((name, tuple(NAMES.intern(person)
+                                          for person in value)))
+
+    def _parse_raw_name(self, author):
+        """Converts LaTeX macros and parses a name seen for the first
+        time."""
+        return self._parse_author_name(latex_to_unicode(author))
 
     def _parse_author_name(self, author):
         """Parses a single author name.
@@ -80,28 +93,16 @@ class AuthorBibTexField(BibTexField):
                 first = " ".join(parts[:-1])
                 jr = ""
 
-        return [last, jr, first]
+        return (last, jr, first)
 
-    def to_json(self):
-        """Returns the entry as a JSON string.
-
-        """
-        jsoned = "\t\t\t\"author\": [\n"
-
-        for author in self.value:
-            jsoned += "\t\t\t\t"
-            jsoned += "{{\"first\": \"{}\", ".format(author[0])
-            jsoned += "\"jr\": \"{}\", ".format(author[1])
-            jsoned += "\"last\": \"{}\"}},\n".format(author[2])
-
-        # Remove trailing comma
-        jsoned = jsoned[:-2] + "\n"
-        jsoned += "\t\t\t],\n"
-        return jsoned
+    def to_json_value(self):
+        """Returns the authors as a list of {"last", "jr", "first"} dicts."""
+        return [{"last": last, "jr": jr, "first": first}
+                for last, jr, first in self.value]
 
     def to_bibtex(self):
-        """Returns the author field as a BibTeX string."""
-        bibtexed = "author = {"
+        """Returns the field as a BibTeX string."""
+        bibtexed = self.name + " = {"
         bibtexed += " and ".join(
             [self._list_to_name(auth) for auth in self.value])
         bibtexed += "}"
@@ -109,7 +110,7 @@ class AuthorBibTexField(BibTexField):
         return bibtexed
 
     def _list_to_name(self, name_list):
-        """Converts a list to a name."""
+        """Converts a (von Last, Jr, First) triplet to a name."""
         if name_list[1] != "":
             return "{}, {}, {}".format(*name_list)
         else:
@@ -119,3 +120,19 @@ class AuthorBibTexField(BibTexField):
         """Returns the author field as an "and, "-separated string."""
         return " and ".join(
             [self._list_to_name(auth) for auth in self.value])
+
+
+class EditorBibTexField(AuthorBibTexField):
+    """Class representing the Editor field, parsed like the Author field."""
+
+    __slots__ = ()
+
+    def __init__(self, field_raw, lazy=False):
+        """Initialises and parses the field.
+
+        Args:
+            field_raw (str): Raw BibTex string as seen in a BibTeX file.
+            lazy (bool): If True, the field is parsed on first access.
+
+        """
+        BibTexField.__init__(self, "editor", field_raw, lazy)
@@ -1,5 +1,5 @@
-from importlib import import_module
-import logging
+import json
+import sys
 
 
 class BibTexField():
@@ -7,8 +7,14 @@ class BibTexField():
     Represents a generic BibTtex field. Base class for fields
     requiring special parsing.
 
+    Instances are slotted and field names are interned, as a bibliography
+    holds millions of fields sharing a handful of names.
+
     Static members:
         _ALLOWED_FIELDS (list): A list of allowed field names.
+        _FIELD_CLASSES (dict): Maps allowed field names to the BibTexField
+            subclasses parsing them, or to None for generic fields.
+            Filled in on first use.
 
     """
 
@@ -19,8 +25,12 @@ class BibTexField():
         'publisher', 'school', 'series', 'title', 'type', 'volume', 'year'
     ]
 
+    _FIELD_CLASSES = None
+
+    __slots__ = ('name', '_raw', '_value')
+
     @staticmethod
-    def create_field(field_name, field_raw):
+    def create_field(field_name, field_raw, lazy=False):
         """BibTexField factory.
 
         Parses raw field text and creates an appropriate object.
@@ -28,6 +38,7 @@ class BibTexField():
         Args:
             field_name (str): Name of the field (e.g. Author or Journal)
             field_raw (str): An unparsed string containing the field value.
+            lazy (bool): If True, the value is parsed on first access.
 
         Returns:
             (BibTexField): A concrete instance derived from BibTexField
@@ -37,46 +48,119 @@ class BibTexField():
             UserWarning if field is not allowed.
 
         """
-        field_name = field_name.lower()
-        if (field_name not in BibTexField._ALLOWED_FIELDS):
-            raise UserWarning(f"Field {field_name} not supported.")
-            return None
-        field = None
-        class_name = field_name.capitalize() + 'BibTexField'
+        field_name = sys.intern(field_name.lower())
+        field_classes = (BibTexField._FIELD_CLASSES or
+                         BibTexField._field_classes())
 
         try:
-            # field_module = import_module(
-            #     field_name)
-            logging.debug(f"Attempting to import {field_name}.")
-            field_module = import_module(f".bibtexmagic.fields.{field_name}",
-                                         package="bibtexmagic")
-            logging.debug(f"Found field subclass for {field_name}.")
+            field_class = field_classes[field_name]
+        except KeyError:
+            raise UserWarning(f"Field {field_name} not supported.")
+
+        if field_class is None:
+            return BibTexField(field_name, field_raw, lazy)
+
+        return field_class(field_raw, lazy)
+
+    @staticmethod
+    def register_field(field_name, field_class):
+        """Registers a class parsing a given field.
+
+        The class is instantiated with the raw field value and the lazy
+        flag, like the built-in subclasses. Classes whose constructor only
+        takes the raw value, as before the lazy mode was added, are still
+        accepted and always parse their value straight away. Registering
+        a field which is not in _ALLOWED_FIELDS makes it allowed.
+
+        Args:
+            field_name (str): Name of the field (e.g. 'doi').
+            field_class: A BibTexField subclass, or None to store the field
+                as a generic BibTexField.
+
+        """
+        field_name = field_name.lower()
+        field_classes = BibTexField._field_classes()
+
+        if field_name not in BibTexField._ALLOWED_FIELDS:
+            BibTexField._ALLOWED_FIELDS.append(field_name)
 
-            field = getattr(field_module, class_name)(field_raw)
+        if field_class is not None:
+            field_class = _lazy_signature(field_class)
 
-        except ImportError:
-            field = BibTexField(field_name, field_raw)
-            logging.debug(f"Creating generic field for {field_name}.")
+        field_classes[field_name] = field_class
 
-        return field
+    @staticmethod
+    def _field_classes():
+        """Returns the field registry, filling it in on first call."""
+        if BibTexField._FIELD_CLASSES is None:
+            # Imported here as the subclasses depend on this module.
+            from .author import AuthorBibTexField, EditorBibTexField
+            from .pages import PagesBibTexField
+            from .title import TitleBibTexField
+
+            field_classes = dict.fromkeys(BibTexField._ALLOWED_FIELDS)
+            field_classes['author'] = AuthorBibTexField
+            field_classes['editor'] = EditorBibTexField
+            field_classes['pages'] = PagesBibTexField
+            field_classes['title'] = TitleBibTexField
+
+            BibTexField._FIELD_CLASSES = field_classes
 
-    def __init__(self, field_name, field_raw):
+        return BibTexField._FIELD_CLASSES
+
+    def __init__(self, field_name, field_raw, lazy=False):
         """Initialises the object.
 
         Args:
             field_name (str): The name of the field, e.g. 'author'.
             field_raw (str): Unparsed field value as seen in a BibTeX file.
+            lazy (bool): If True, parse_field is only called the first time
+                the value is accessed.
 
         """
         self.name = field_name
-        self.value = field_raw
+        self._raw = field_raw
+        self._value = None
+
+        if not lazy:
+            self._value = self.parse_field(field_raw)
+            self._raw = None
 
-    def parse_field(self, field_raw, parser_options):
+    @property
+    def value(self):
+        """The parsed value of the field, parsed on first access."""
+        if self._raw is not None:
+            self._value = self.parse_field(self._raw)
+            self._raw = None
+
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._raw = None
+
+    def parse_field(self, field_raw):
         """Field-specific parser."""
         return field_raw
 
+    def __getstate__(self):
+        """Pickles the field as a plain tuple of its parsed value."""
+        return self.name, self.value
+
+    def __setstate__(self, state):
+        """Restores the field without parsing it again."""
+        self.name, self._value = state
+        self._raw = None
+
+    def to_json_value(self):
+        """Returns the value as an object serializable by the json module."""
+        return self.value
+
     def to_json(self):
-        return "\t\t\t\"{}\": \"{}\",\n".format(self.name, self.value)
+        """Returns the field as a '"name": value' JSON member."""
+        return json.dumps(self.name) + ": " + json.dumps(
+            self.to_json_value(), ensure_ascii=False)
 
     def to_bibtex(self):
         return "{} = {{{}}}".format(self.name, self.value)
@@ -86,3 +170,23 @@ class BibTexField():
 
     def __repr__(self):
         return f"<{self.name}: {self.value}>"
+
+
+def _lazy_signature(field_class):
+    """Returns field_class if it takes the (field_raw, lazy) arguments,
+    otherwise a factory calling it with field_raw only."""
+    # Imported here, as it is only needed when registering fields.
+    import functools
+    import inspect
+
+    try:
+        inspect.signature(field_class).bind("", False)
+        return field_class
+    except (TypeError, ValueError):
+        pass
+
+    def create(field_raw, lazy=False):
+        return field_class(field_raw)
+
+    # Keeps the name of the class, e.g. in the snapshot names.
+    return functools.update_wrapper(create, field_class, updated=())
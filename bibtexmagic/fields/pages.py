@@ -6,15 +6,17 @@ from .field import BibTexField
 class PagesBibTexField(BibTexField):
     """Class representing a 'pages' BibTeX field."""
 
-    def __init__(self, field_raw):
+    __slots__ = ()
+
+    def __init__(self, field_raw, lazy=False):
         """Initialises and parses the field.
 
         Args:
             field_raw (str): Raw BibTex string as seen in a BibTeX file.
+            lazy (bool): If True, the field is parsed on first access.
 
         """
-        self.name = "pages"
-        self.value = self.parse_field(field_raw)
+        super().__init__("pages", field_raw, lazy)
 
     def parse_field(self, field_raw):
         """Parses the field.
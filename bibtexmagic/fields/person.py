@@ -0,0 +1,111 @@
+import threading
+from collections import namedtuple
+from itertools import islice
+
+
+class Person(namedtuple('Person', ['last', 'jr', 'first'])):
+    """
+    An author or editor name. It is a (von Last, Jr, First) tuple and
+    compares equal to a plain tuple of the same parts.
+
+    Persons are interned in a NameTable, so that the fields naming the
+    same person share a single object.
+
+    """
+
+    __slots__ = ()
+
+
+class NameTable():
+    """
+    Table of the persons named in the parsed author and editor fields.
+
+    Every distinct raw name is parsed once. Raw names which differ but
+    parse to the same parts, e.g. 'First Last' and 'Last, First', map to
+    the same Person object. The table can be shared by threads.
+
+    The table is bounded: once it holds more than maxsize raw names (or
+    persons), the older half of them is forgotten. Unlike in an LRU
+    cache, lookups do not reorder the table, so that they stay a single
+    dict lookup. Fields parsed afterwards get an equal, but no longer
+    the same, Person.
+
+    Members:
+        maxsize (int): Maximum number of raw names, and of persons, kept.
+
+    """
+
+    def __init__(self, maxsize=100000):
+        """Initialises an empty table."""
+        self.maxsize = maxsize
+
+        self._by_raw = {}
+        self._people = {}
+        self._lock = threading.Lock()
+
+    def person(self, raw, parse):
+        """
+        Returns the Person of a raw name.
+
+        Args:
+            raw (str): Name as found in the field.
+            parse: Called as parse(raw) to split a name seen for the
+                first time into (von Last, Jr, First).
+
+        Returns:
+            Person: The shared object.
+
+        """
+        person = self._by_raw.get(raw)
+        if person is None:
+            person = self.intern(parse(raw))
+            with self._lock:
+                _insert(self._by_raw, raw, person, self.maxsize)
+
+        return person
+
+    def intern(self, name):
+        """
+        Returns the shared Person equal to a (von Last, Jr, First) tuple,
+        adding it to the table if needed. Used for the persons restored
+        by unpickling, e.g. from a snapshot or a worker process.
+        """
+        person = self._people.get(name)
+        if person is None:
+            person = name if type(name) is Person else Person(*name)
+            with self._lock:
+                person = self._people.setdefault(person, person)
+                _insert(self._people, person, person, self.maxsize)
+
+        return person
+
+    def get(self, name, default=None):
+        """Returns the shared Person equal to a (last, jr, first) tuple,
+        or default."""
+        return self._people.get(tuple(name), default)
+
+    def __len__(self):
+        return len(self._people)
+
+    def __iter__(self):
+        return iter(list(self._people))
+
+    def clear(self):
+        """Forgets all the names. Fields parsed afterwards no longer share
+        the persons with the fields parsed before."""
+        with self._lock:
+            self._by_raw.clear()
+            self._people.clear()
+
+
+def _insert(table, key, value, maxsize):
+    """Adds a key to a dict. Once the dict grows beyond maxsize, its older
+    half is removed at once, so that every key costs constant time."""
+    table[key] = value
+    if len(table) > maxsize:
+        for old in list(islice(table, len(table) - maxsize // 2)):
+            del table[old]
+
+
+# Shared by all the parsers.
+NAMES = NameTable()
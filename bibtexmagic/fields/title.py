@@ -1,20 +1,22 @@
 from .field import BibTexField
-from ..bibtexmagic import BibTexMagic
+from ..latextouni import latex_to_unicode, unicode_to_latex
 from ..helper import get_parentheses
 
 
 class TitleBibTexField(BibTexField):
     """Initialises and parses the field."""
 
-    def __init__(self, field_raw):
+    __slots__ = ()
+
+    def __init__(self, field_raw, lazy=False):
         """Initialises and parses the field.
 
         Args:
             field_raw (str): Raw BibTex string as seen in a BibTeX file.
+            lazy (bool): If True, the field is parsed on first access.
 
         """
-        self.name = "title"
-        self.value = self.parse_field(field_raw)
+        super().__init__("title", field_raw, lazy)
 
     def parse_field(self, field_raw):
         """Parses the field.
@@ -30,7 +32,7 @@ class TitleBibTexField(BibTexField):
             A parsed title.
 
         """
-        field_raw = BibTexMagic.latex_to_unicode(field_raw)
+        field_raw = latex_to_unicode(field_raw)
 
         par = get_parentheses(field_raw)
 
@@ -44,6 +46,6 @@ class TitleBibTexField(BibTexField):
         to_return += field_raw[pos:].lower()
         to_return = to_return[0].upper() + to_return[1:]
 
-        to_return = BibTexMagic.unicode_to_latex(to_return)
+        to_return = unicode_to_latex(to_return)
 
         return to_return
@@ -1,3 +1,16 @@
+import re
+import unicodedata
+
+from .lexer import iter_braces
+from .latextouni import latex_to_unicode
+
+
+_BRACES = str.maketrans('', '', '{}')
+_WORD = re.compile(r'\w+')
+# Accent macros without braces around their letter, e.g. \"u or {\'e}.
+_SHORT_ACCENT = re.compile(r'\\(["\'`^~=.])\s*([A-Za-z])')
+
+
 def get_parentheses(s, stop_on_closing=False):
     """Looks up opening/closing parentheses pairs in a string.
 
@@ -18,10 +31,11 @@ def get_parentheses(s, stop_on_closing=False):
     to_return = {}
     pstack = []
 
-    for i, c in enumerate(s):
-        if c == '{':
+    for match in iter_braces(s):
+        i = match.start()
+        if match.group() == '{':
             pstack.append(i)
-        elif c == '}':
+        else:
             if not pstack:
                 raise IndexError("No matching opening for " + str(i))
             to_return[pstack.pop()] = i
@@ -34,3 +48,30 @@ def get_parentheses(s, stop_on_closing=False):
         raise IndexError("No matching closing for " + str(pstack.pop()))
 
     return to_return
+
+
+def fold(text):
+    """Folds a text for comparison and sorting: converts LaTeX macros,
+    strips braces and accents and casefolds it, e.g.
+    'Erd\\H{o}s' --> 'erdos'. Accent macros may also be written without
+    braces, e.g. 'M{\\"u}ller' --> 'muller'.
+
+    Args:
+        text (str): Text to be folded.
+
+    Returns:
+        str: Folded text.
+
+    """
+    text = _SHORT_ACCENT.sub(r'\\\1{\2}', text)
+    text = latex_to_unicode(text).translate(_BRACES)
+    text = unicodedata.normalize('NFKD', text)
+
+    return "".join(c for c in text
+                   if not unicodedata.combining(c)).casefold()
+
+
+def fold_words(text):
+    """Returns the words of a folded text, see fold, e.g.
+    'Erd\\H{o}s, {P}aul' --> ['erdos', 'paul']."""
+    return _WORD.findall(fold(text))
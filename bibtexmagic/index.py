@@ -0,0 +1,138 @@
+from bisect import bisect_left, bisect_right, insort
+from functools import reduce
+
+
+class EntryIndex():
+    """
+    Secondary indexes of a bibliography over author last names, years,
+    journals and entry types.
+
+    Every index maps a normalised value to the set of entries having it,
+    so that a query only touches the entries it returns. Author last names
+    and journals are matched case-insensitively. An author is indexed both
+    under the full last name ('von last') and its final word ('last').
+    The 'people' index maps every Person to the entries naming them as an
+    author or an editor.
+
+    """
+
+    def __init__(self):
+        """Initialises empty indexes."""
+        self.authors = {}
+        self.years = {}
+        self.journals = {}
+        self.entry_types = {}
+        self.people = {}
+
+        self._sorted_years = []
+        self._order = {}
+        self._counter = 0
+
+    def add(self, entry):
+        """Indexes an entry."""
+        self._order[entry] = self._counter
+        self._counter += 1
+
+        for value, index in self._values(entry):
+            if index is self.years and value not in self.years:
+                insort(self._sorted_years, value)
+            index.setdefault(value, set()).add(entry)
+
+    def remove(self, entry):
+        """Removes an entry from the indexes."""
+        del self._order[entry]
+
+        for value, index in self._values(entry):
+            entries = index.get(value)
+            if entries is None:
+                continue
+            entries.discard(entry)
+            if not entries:
+                del index[value]
+                if index is self.years:
+                    self._sorted_years.remove(value)
+
+    def query(self, author=None, year=None, journal=None, entry_type=None):
+        """
+        Finds the entries matching all the given criteria.
+
+        Args:
+            author (str): Last name of one of the authors.
+            year: A year, or an inclusive (first, last) range of years
+                where either bound may be None.
+            journal (str): Journal name.
+            entry_type (str): Entry type, e.g. 'article'.
+
+        Returns:
+            list: Matching entries in the order they were added.
+
+        """
+        candidates = []
+
+        if author is not None:
+            candidates.append(self.authors.get(author.casefold(), set()))
+        if journal is not None:
+            candidates.append(self.journals.get(journal.casefold(), set()))
+        if entry_type is not None:
+            candidates.append(
+                self.entry_types.get(entry_type.lower(), set()))
+        if year is not None:
+            candidates.append(self._year_range(year))
+
+        if not candidates:
+            matching = self._order.keys()
+        else:
+            candidates.sort(key=len)
+            matching = reduce(set.intersection, candidates[1:],
+                              set(candidates[0]))
+
+        return sorted(matching, key=self._order.__getitem__)
+
+    def works(self, person):
+        """Returns the entries naming a person as an author or an editor,
+        in the order they were added."""
+        return sorted(self.people.get(tuple(person), ()),
+                      key=self._order.__getitem__)
+
+    def _year_range(self, year):
+        """Returns the set of entries published in a year or a range."""
+        if not isinstance(year, tuple):
+            return self.years.get(int(year), set())
+
+        first, last = year
+        lo = 0 if first is None else bisect_left(self._sorted_years, first)
+        hi = (len(self._sorted_years) if last is None
+              else bisect_right(self._sorted_years, last))
+
+        entries = set()
+        for y in self._sorted_years[lo:hi]:
+            entries |= self.years[y]
+
+        return entries
+
+    def _values(self, entry):
+        """Yields (value, index) pairs under which an entry is indexed."""
+        yield entry.entry_type, self.entry_types
+
+        names = set()
+        people = set()
+        for field in entry.fields:
+            if field.name == 'author':
+                for author in field.value:
+                    last = author[0].casefold()
+                    names.add(last)
+                    names.add(last.rsplit(" ", 1)[-1])
+                people.update(field.value)
+            elif field.name == 'editor':
+                people.update(field.value)
+            elif field.name == 'year':
+                year = field.value.strip()
+                if year.isdigit():
+                    yield int(year), self.years
+            elif field.name == 'journal':
+                yield field.value.strip().casefold(), self.journals
+
+        for name in names:
+            yield name, self.authors
+        for person in people:
+            yield person, self.people
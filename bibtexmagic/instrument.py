@@ -0,0 +1,205 @@
+from collections import Counter
+from contextlib import contextmanager
+from inspect import isgeneratorfunction
+from time import perf_counter
+
+from . import entry, latextouni
+from .entry import BibTexEntry
+from .fields import title
+from .fields.author import AuthorBibTexField
+from .fields.field import BibTexField
+from .fields.pages import PagesBibTexField
+from .fields.title import TitleBibTexField
+from .lexer import EntryScanner
+
+
+class ParserStats():
+    """
+    Cumulative timings and counters of the parser phases, recorded while
+    the parser is instrumented, see BibTexMagic.instrument.
+
+    Phases are named after the instrumented functions: 'split_entries'
+    (finding the entries in the file, one call per entry found and per
+    chunk scanned), 'parse_entry', 'scan_header' and 'scan_fields'
+    (locating the fields and matching their braces), 'create_field'
+    (field dispatch), 'author', 'title' and 'pages' (parsing the values),
+    'get_parentheses', 'latex_to_unicode' and 'unicode_to_latex' (the
+    conversions missing the caches, the hits are counted by the caches
+    themselves, see BibTexMagic.cache_stats). Timings are exclusive: the
+    time a phase spends in another instrumented phase, e.g. a title
+    converting LaTeX macros, is only counted for the inner one.
+
+    Members:
+        timings (Counter): Seconds spent in every phase.
+        calls (Counter): Number of calls of every phase.
+        fields (Counter): Number of fields created per field name.
+        scanned (int): Length of the entry text scanned, in characters,
+            or in bytes for bytes input.
+
+    """
+
+    def __init__(self):
+        """Initialises empty counters."""
+        self.timings = Counter()
+        self.calls = Counter()
+        self.fields = Counter()
+        self.scanned = 0
+
+        # Time spent in nested phases, per active call.
+        self._stack = []
+
+    @property
+    def entries(self):
+        """Number of entries parsed."""
+        return self.calls['parse_entry']
+
+    @property
+    def conversions(self):
+        """Number of LaTeX to unicode and unicode to LaTeX conversions
+        computed, i.e. not found in the caches."""
+        return (self.calls['latex_to_unicode'] +
+                self.calls['unicode_to_latex'])
+
+    def to_dict(self):
+        """Returns the timings and counters as a dict."""
+        return {
+            'timings': dict(self.timings),
+            'calls': dict(self.calls),
+            'fields': dict(self.fields),
+            'entries': self.entries,
+            'conversions': self.conversions,
+            'get_parentheses': self.calls['get_parentheses'],
+            'scanned': self.scanned,
+        }
+
+
+def _count_entry(stats, args):
+    """Counts the text of an entry passed to parse_entry."""
+    stats.scanned += len(args[1])
+
+
+def _count_field(stats, args):
+    """Counts a field passed to create_field by its name."""
+    stats.fields[args[0].lower()] += 1
+
+
+# (owner, attribute, phase, counter) of every instrumented function.
+# Functions imported by name are replaced in the importing module. The
+# caches are kept in place, only the function they memoize is wrapped.
+_HOOKS = [
+    (EntryScanner, 'spans', 'split_entries', None),
+    (BibTexEntry, 'parse_entry', 'parse_entry', _count_entry),
+    (entry, 'scan_header', 'scan_header', None),
+    (entry, 'scan_fields', 'scan_fields', None),
+    (BibTexField, 'create_field', 'create_field', _count_field),
+    (AuthorBibTexField, 'parse_field', 'author', None),
+    (TitleBibTexField, 'parse_field', 'title', None),
+    (PagesBibTexField, 'parse_field', 'pages', None),
+    (title, 'get_parentheses', 'get_parentheses', None),
+    (latextouni.LATEX_TO_UNICODE_CACHE, 'function', 'latex_to_unicode',
+     None),
+    (latextouni.UNICODE_TO_LATEX_CACHE, 'function', 'unicode_to_latex',
+     None),
+]
+
+_ACTIVE = False
+
+
+def _timed(stats, phase, function, count, callback):
+    """Wraps a function to record its calls and exclusive time."""
+    stack = stats._stack
+    timings = stats.timings
+    calls = stats.calls
+
+    def timed(*args, **kwargs):
+        if count is not None:
+            count(stats, args)
+
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            own = elapsed - stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            timings[phase] += own
+            calls[phase] += 1
+            if callback is not None:
+                callback(phase, own)
+
+    return timed
+
+
+def _timed_steps(stats, phase, function, count, callback):
+    """Wraps a generator function to record every step of the generators
+    it returns, leaving out the time spent by their consumers."""
+    step = _timed(stats, phase, next, count, callback)
+
+    def timed(*args, **kwargs):
+        iterator = function(*args, **kwargs)
+        try:
+            while True:
+                try:
+                    item = step(iterator)
+                except StopIteration:
+                    return
+                yield item
+        finally:
+            iterator.close()
+
+    return timed
+
+
+@contextmanager
+def instrumented(callback=None):
+    """
+    Records the parser phases while the context is active.
+
+    The instrumented functions are wrapped on entering the context and
+    restored on leaving it, so that the parser runs unchanged otherwise.
+    The instrumentation is global to the process: it covers every parser
+    while active, but not the worker processes of a parallel parse.
+
+    Args:
+        callback: Called as callback(phase, seconds) after every call of
+            an instrumented function.
+
+    Yields:
+        ParserStats: Filled in while the context is active.
+
+    Raises:
+        RuntimeError if the parser is already instrumented.
+
+    """
+    global _ACTIVE
+    if _ACTIVE:
+        raise RuntimeError("The parser is already instrumented.")
+
+    stats = ParserStats()
+
+    originals = []
+    for owner, name, phase, count in _HOOKS:
+        original = vars(owner)[name]
+        function = original
+        if isinstance(original, staticmethod):
+            function = original.__func__
+
+        if isgeneratorfunction(function):
+            wrapper = _timed_steps(stats, phase, function, count, callback)
+        else:
+            wrapper = _timed(stats, phase, function, count, callback)
+        if isinstance(original, staticmethod):
+            wrapper = staticmethod(wrapper)
+
+        originals.append((owner, name, original))
+        setattr(owner, name, wrapper)
+
+    _ACTIVE = True
+    try:
+        yield stats
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+        _ACTIVE = False
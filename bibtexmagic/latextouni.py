@@ -1,5 +1,11 @@
 import re
 
+from .lrucache import LRUCache
+
+
+# str.isascii() is not available before Python 3.7.
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
 
 class LatexToUni():
     """
@@ -11,23 +17,25 @@ class LatexToUni():
     def __init__(self):
         """Initialises the LatexToUni class.
 
-        Based on the _UNI2LAT dictionary, constructs a dictionary
-        with keys and values reversed to allow parsing in both
-        directions.
+        Based on the _UNI2LAT table, builds a character class of all
+        the unicode characters and a trie of all the LaTeX macros, used
+        to find them in a single pass.
 
         Static members:
             _UNI2LAT (list): A list containing pairs of the form
-                [latex_macro, corresponding_regex].
+                [unicode_character, corresponding_regex].
 
         """
-        unis = [pair[0] for pair in self._UNI2LAT]
-        macros = [pair[1] for pair in self._UNI2LAT]
-        self.pattern_uni2lat = re.compile(r'|'.join(unis))
-        self.pattern_lat2uni = re.compile(r'|'.join(macros))
-
         # Construct dictionaries for fast lookup
-        self.uni2lat_dict = {pair[0]: pair[1] for pair in self._UNI2LAT}
-        self.lat2uni_dict = {pair[1]: pair[0] for pair in self._UNI2LAT}
+        self.uni2lat_dict = {pair[0]: self._re_to_string(pair[1])
+                             for pair in self._UNI2LAT}
+        self.lat2uni_dict = {macro: uni
+                             for uni, macro in self.uni2lat_dict.items()}
+
+        self.pattern_uni2lat = re.compile(
+            '([' + ''.join(map(re.escape, self.uni2lat_dict)) + '])')
+        self.pattern_lat2uni = re.compile(
+            '(' + self._trie_to_re(self._build_trie(self.lat2uni_dict)) + ')')
 
     def uni_to_lat(self, s):
         """Replaces unicode characters with LaTeX macros.
@@ -39,11 +47,17 @@ class LatexToUni():
             str: Parsed string.
 
         """
-        return self._re_to_string(self.pattern_uni2lat.sub(
-                             lambda x: self.uni2lat_dict[x.group()], s))
+        if _NON_ASCII.search(s) is None:
+            return s
+
+        return self._replace(s, self.pattern_uni2lat, self.uni2lat_dict)
 
     def lat_to_uni(self, s):
-        """Replaces LaTeX macros with their unicode equivalents
+        """Replaces LaTeX macros with their unicode equivalents.
+
+        The macros are found in a single pass, always taking the longest
+        macro matching at a given position (e.g. \\iota rather than \\i).
+
         Args:
             s (str): String to be parsed.
 
@@ -51,16 +65,56 @@ class LatexToUni():
             str: Parsed string.
 
         """
-        return self.pattern_lat2uni.sub(
-                    lambda x: self.lat2uni_dict[self._string_to_re(x.group())],
-                    s)
+        # Every macro contains either a backslash or a caret.
+        if '\\' not in s and '^' not in s:
+            return s
+
+        return self._replace(s, self.pattern_lat2uni, self.lat2uni_dict)
+
+    @staticmethod
+    def _replace(s, pattern, replacements):
+        """Replaces all the matches of pattern using a dictionary, without
+        calling back into Python for every match."""
+        # Splitting on a capturing group puts the matches at odd positions.
+        parts = pattern.split(s)
+        parts[1::2] = map(replacements.__getitem__, parts[1::2])
+
+        return "".join(parts)
+
+    @staticmethod
+    def _build_trie(words):
+        """Builds a trie of nested dictionaries, where the '' key marks
+        the end of a word."""
+        trie = {}
+        for word in words:
+            node = trie
+            for c in word:
+                node = node.setdefault(c, {})
+            node[''] = True
+
+        return trie
+
+    @staticmethod
+    def _trie_to_re(node):
+        """Converts a trie to a regex matching its longest word.
+
+        Every optional suffix is greedy, so the regex engine tries to
+        extend a match before settling for a shorter word.
 
-    def _string_to_re(self, s):
-        """
-        Convertrs from a Python string representation to
-        a corresponding regex
         """
-        return s.replace('\\', '\\\\').replace('^', '\\^')
+        branches = [re.escape(c) + LatexToUni._trie_to_re(child)
+                    for c, child in sorted(node.items()) if c != '']
+
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+
+        pattern = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            pattern += '?'
+
+        return pattern
 
     def _re_to_string(self, s):
         """Converts a regex to a corresponding Python string"""
@@ -68,9 +122,7 @@ class LatexToUni():
 
     # Source: https://gist.github.com/beniwohli/798549
     # This matches LaTeX macros with their corresponding regular expressions.
-    # Note that the order of macros matters: if macro A contains macro B,
-    # it has to appear _before_ it in a list, e.g. \\\\iota appears
-    # before \\\\i.
+    # The order of macros does not matter, the longest one always wins.
     _UNI2LAT = [
                 [u"\u03B9", "\\\\iota"],
                 [u"\u03BB", "\\\\lambda"],
@@ -305,3 +357,32 @@ class LatexToUni():
                 [u"\u03C7", "\\\\chi"],
                 [u"\u03C8", "\\\\psi"],
         ]
+
+
+_CONVERTER = None
+
+
+def get_converter():
+    """Returns the shared LatexToUni converter, building it on first use
+    rather than when the package is imported."""
+    global _CONVERTER
+    if _CONVERTER is None:
+        _CONVERTER = LatexToUni()
+
+    return _CONVERTER
+
+
+LATEX_TO_UNICODE_CACHE = LRUCache(lambda s: get_converter().lat_to_uni(s))
+UNICODE_TO_LATEX_CACHE = LRUCache(lambda s: get_converter().uni_to_lat(s))
+
+
+def latex_to_unicode(text):
+    """Converts LaTeX macros to unicode characters with the shared converter,
+    memoized in LATEX_TO_UNICODE_CACHE."""
+    return LATEX_TO_UNICODE_CACHE(text)
+
+
+def unicode_to_latex(text):
+    """Converts unicode characters to LaTeX macros with the shared converter,
+    memoized in UNICODE_TO_LATEX_CACHE."""
+    return UNICODE_TO_LATEX_CACHE(text)
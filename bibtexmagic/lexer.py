@@ -0,0 +1,422 @@
+import re
+from collections import namedtuple
+
+
+def _balanced_braces(depth):
+    """Returns a regex matching a brace group nested up to depth levels.
+
+    The inner loops are unrolled ('[^{}]*(?:group[^{}]*)*'), so that a
+    failed match backtracks in linear time.
+
+    """
+    group = r'\{[^{}]*\}'
+    for _ in range(depth - 1):
+        group = r'\{[^{}]*(?:' + group + r'[^{}]*)*\}'
+    return group
+
+
+class _Syntax():
+    """Compiled patterns and tokens of the lexer, either for str input or
+    for bytes-like input (bytes or mmap)."""
+
+    def __init__(self, encode):
+        """Compiles the patterns, passing each of them through encode."""
+        def compile(pattern):
+            return re.compile(encode(pattern))
+
+        self.braces = compile(r'[{}]')
+        self.quoted = compile(r'[{}"]')
+        self.outside_entry = compile(r'[@%]')
+        self.entry_opening = compile(r'[@{]')
+        self.line_end = compile(r'\n')
+
+        # Most entries and values nest only a few levels deep and are
+        # matched in C. Deeper (or unfinished) groups fall back to
+        # counting braces.
+        self.balanced = compile(_balanced_braces(4))
+
+        self.header = compile(r'\s*([^{\s]*)\s*\{\s*([^,}\s]*)\s*')
+        self.separator = compile(r'[\s,]*')
+        self.field_name = compile(r'([^\s=,{}"]+)\s*=\s*')
+        self.bare_value = compile(r'[^,}\s]+')
+
+        self.opening = encode('{')
+        self.closing = encode('}')
+        self.quote = encode('"')
+        self.comment = encode('%')
+        self.at = encode('@')
+
+
+_STR_SYNTAX = _Syntax(str)
+_BYTES_SYNTAX = None
+
+
+def _syntax(text):
+    """Returns the patterns matching the type of text. The bytes patterns
+    are only compiled on first use."""
+    global _BYTES_SYNTAX
+    if isinstance(text, str):
+        return _STR_SYNTAX
+
+    if _BYTES_SYNTAX is None:
+        _BYTES_SYNTAX = _Syntax(str.encode)
+
+    return _BYTES_SYNTAX
+
+
+EntrySpans = namedtuple('EntrySpans', ['entry_type', 'key', 'fields', 'end'])
+EntrySpans.__doc__ = """Offsets of the parts of a single entry.
+
+    All the functions of this module accept str as well as bytes-like
+    text (bytes, or an mmap for EntryScanner), in which case the offsets
+    are byte offsets.
+
+    entry_type, key: (start, end) pairs.
+    fields: A list of (name_start, name_end, value_start, value_end) tuples.
+    end: Position just after the closing brace of the entry.
+
+"""
+
+
+def iter_braces(text, pos=0, endpos=None):
+    """Returns an iterator of match objects for all the braces in
+    text[pos:endpos], without copying the text."""
+    if endpos is None:
+        endpos = len(text)
+    return _syntax(text).braces.finditer(text, pos, endpos)
+
+
+def match_brace(text, pos, endpos=None):
+    """Finds the brace closing the one opened at text[pos].
+
+    Args:
+        text (str or bytes): Text to be scanned.
+        pos (int): Position of the opening brace.
+        endpos (int): Position at which the scan stops.
+
+    Returns:
+        int: Position of the matching closing brace.
+
+    Raises:
+        IndexError if the brace is not closed before endpos.
+
+    """
+    if endpos is None:
+        endpos = len(text)
+
+    syntax = _syntax(text)
+    match = syntax.balanced.match(text, pos, endpos)
+    if match is not None:
+        return match.end() - 1
+
+    # Jump from one closing brace to the next and count the opening ones
+    # in between, so that the text between braces is scanned in C.
+    depth = 1
+    start = pos + 1
+    while True:
+        close = text.find(syntax.closing, start, endpos)
+        if close == -1:
+            raise IndexError("No matching closing for " + str(pos))
+
+        depth += text.count(syntax.opening, start, close) - 1
+        if depth == 0:
+            return close
+        start = close + 1
+
+
+def scan_header(text, pos=0):
+    """Locates the entry type and the citation key of an entry.
+
+    Args:
+        text (str): Text containing the entry, starting after the '@'.
+        pos (int): Position at which the entry starts.
+
+    Returns:
+        tuple: ((type_start, type_end), (key_start, key_end), fields_start)
+
+    Raises:
+        ValueError if the entry has no opening brace.
+
+    """
+    match = _syntax(text).header.match(text, pos)
+    if match is None:
+        raise ValueError("Malformed entry at " + str(pos))
+
+    return match.span(1), match.span(2), match.end()
+
+
+def scan_fields(text, pos=0, endpos=None):
+    """Locates the names and values of the fields of an entry.
+
+    The text is walked once and only offsets are recorded. Values may be
+    enclosed in braces, in double quotes or be bare words (e.g. numbers).
+
+    Args:
+        text (str): Text containing the entry.
+        pos (int): Position after the citation key.
+        endpos (int): Position at which the scan stops.
+
+    Returns:
+        tuple: A list of (name_start, name_end, value_start, value_end)
+            tuples and the position after the closing brace of the entry.
+
+    Raises:
+        ValueError if a field is malformed.
+        IndexError if the braces do not match.
+
+    """
+    if endpos is None:
+        endpos = len(text)
+
+    syntax = _syntax(text)
+    fields = []
+    while True:
+        pos = syntax.separator.match(text, pos, endpos).end()
+        if pos >= endpos:
+            return fields, pos
+
+        opening = text[pos:(pos+1)]
+        if opening == syntax.closing:
+            return fields, pos + 1
+
+        name = syntax.field_name.match(text, pos, endpos)
+        if name is None:
+            raise ValueError("Malformed field at " + str(pos))
+        pos = name.end()
+
+        if pos >= endpos:
+            raise ValueError("Missing value of field at " + str(name.start()))
+
+        opening = text[pos:(pos+1)]
+        if opening == syntax.opening:
+            value_start = pos + 1
+            value_end = match_brace(text, pos, endpos)
+            pos = value_end + 1
+        elif opening == syntax.quote:
+            value_start = pos + 1
+            value_end = _match_quote(text, pos, endpos)
+            pos = value_end + 1
+        else:
+            value = syntax.bare_value.match(text, pos, endpos)
+            if value is None:
+                raise ValueError("Missing value of field at " +
+                                 str(name.start()))
+            value_start, value_end = value.span()
+            pos = value_end
+
+        fields.append((name.start(1), name.end(1), value_start, value_end))
+
+
+def scan_entry(text, pos=0, endpos=None):
+    """Locates all the parts of a single entry in one pass.
+
+    Args:
+        text (str): Text containing the entry, starting after the '@'.
+        pos (int): Position at which the entry starts.
+        endpos (int): Position at which the scan stops.
+
+    Returns:
+        EntrySpans: Offsets of the entry type, key and fields.
+
+    """
+    type_span, key_span, fields_start = scan_header(text, pos)
+    fields, end = scan_fields(text, fields_start, endpos)
+
+    return EntrySpans(type_span, key_span, fields, end)
+
+
+def _match_quote(text, pos, endpos):
+    """Finds the double quote closing the one at text[pos], skipping
+    the quotes nested in braces."""
+    syntax = _syntax(text)
+    depth = 0
+    for match in syntax.quoted.finditer(text, pos + 1, endpos):
+        c = match.group()
+        if c == syntax.opening:
+            depth += 1
+        elif c == syntax.closing:
+            depth -= 1
+        elif depth == 0:
+            return match.start()
+
+    raise IndexError("No matching closing quote for " + str(pos))
+
+
+class EntryScanner():
+    """
+    Resumable scanner locating the entries in a BibTeX text.
+
+    Lines starting with '%' outside of entries are treated as comments,
+    '@' signs nested in braces (e.g. in e-mail addresses) do not start
+    a new entry. When the text ends in the middle of an entry, the scan
+    can be resumed once more text is available.
+
+    Members:
+        pos (int): Position at which the next scan starts.
+        start (int): Position of the '@' of an unfinished entry or None.
+        depth (int): Brace depth reached in the unfinished entry.
+
+    """
+
+    def __init__(self):
+        """Initialises a scanner at the beginning of a text."""
+        self.pos = 0
+        self.start = None
+        self.depth = 0
+
+    def spans(self, text, endpos=None):
+        """Yields (start, end) spans of complete entries in text.
+
+        text[start] is the '@' sign and text[end - 1] the closing brace.
+        The scan stops at endpos, leaving the state needed to resume it.
+
+        """
+        if endpos is None:
+            endpos = len(text)
+
+        syntax = _syntax(text)
+        pos = self.pos
+        while True:
+            if self.start is None:
+                match = syntax.outside_entry.search(text, pos, endpos)
+                if match is None:
+                    self.pos = endpos
+                    return
+
+                if match.group() == syntax.comment:
+                    line_end = syntax.line_end.search(text, match.end(),
+                                                      endpos)
+                    if line_end is None:
+                        # Comment continues past endpos.
+                        self.pos = match.start()
+                        return
+                    pos = line_end.end()
+                    continue
+
+                self.start = match.start()
+                self.depth = 0
+                pos = match.end()
+
+            if self.depth == 0:
+                match = syntax.entry_opening.search(text, pos, endpos)
+                if match is None:
+                    self.pos = endpos
+                    return
+
+                pos = match.end()
+                if match.group() == syntax.at:
+                    # Stray '@' before the entry opened, start over.
+                    self.start = match.start()
+                    continue
+
+                match = syntax.balanced.match(text, match.start(), endpos)
+                if match is not None:
+                    pos = match.end()
+                    start, self.start = self.start, None
+                    yield start, pos
+                    continue
+                self.depth = 1
+
+            for match in syntax.braces.finditer(text, pos, endpos):
+                if match.group() == syntax.opening:
+                    self.depth += 1
+                    continue
+
+                self.depth -= 1
+                if self.depth == 0:
+                    pos = match.end()
+                    start, self.start = self.start, None
+                    yield start, pos
+                    break
+            else:
+                self.pos = endpos
+                return
+
+    def shift(self, offset):
+        """Moves the state by offset after the scanned text was trimmed."""
+        self.pos -= offset
+        if self.start is not None:
+            self.start -= offset
+
+    def finish(self):
+        """Checks that the scanned text did not end inside an entry.
+
+        Raises:
+            IndexError if the last entry is not closed.
+
+        """
+        if self.start is not None and self.depth > 0:
+            raise IndexError("No matching closing for entry at " +
+                             str(self.start))
+
+
+def iter_entry_spans(text, pos=0, endpos=None):
+    """Yields (start, end) spans of all entries in a complete text.
+
+    Raises:
+        IndexError if the last entry is not closed.
+
+    """
+    scanner = EntryScanner()
+    scanner.pos = pos
+    yield from scanner.spans(text, endpos)
+    scanner.finish()
+
+
+class EntrySplitter():
+    """
+    Splits BibTeX text fed chunk by chunk into raw entries, keeping only
+    the entry being scanned (plus the current chunk) in memory.
+
+    """
+
+    def __init__(self):
+        """Initialises a splitter at the beginning of a text."""
+        self._scanner = EntryScanner()
+        self._buf = ""
+
+    def feed(self, chunk):
+        """Yields the raw entries completed by the next chunk of text,
+        without the leading '@', e.g. 'article{key, title = {...}}'."""
+        scanner = self._scanner
+
+        # Drop the text which has already been consumed.
+        cut = scanner.pos if scanner.start is None else scanner.start
+        buf = self._buf = self._buf[cut:] + chunk
+        scanner.shift(cut)
+
+        for start, end in scanner.spans(buf):
+            yield buf[(start+1):end]
+
+    def finish(self):
+        """Checks that the text did not end inside an entry.
+
+        Raises:
+            IndexError if the last entry is not closed.
+
+        """
+        self._scanner.finish()
+
+
+def split_entries(chunks):
+    """Splits a stream of BibTeX text into raw entries.
+
+    The text is consumed chunk by chunk and every entry is yielded as soon
+    as its closing brace is found, see EntrySplitter.
+
+    Args:
+        chunks: An iterable of strings, e.g. consecutive reads of a file.
+
+    Yields:
+        str: Raw entry text without the leading '@', e.g.
+            'article{key, title = {...}}'.
+
+    Raises:
+        IndexError if the last entry is not closed.
+
+    """
+    splitter = EntrySplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+
+    splitter.finish()
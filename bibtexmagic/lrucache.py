@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache():
+    """
+    Size-bounded memoization of a single-argument function, evicting the
+    least recently used results first.
+
+    The cache can be shared by threads, e.g. the ones of a thread pool
+    passed to BibTexMagic.aparse. The function itself is called outside
+    the lock, so two threads missing the same key may both compute it.
+
+    Members:
+        function: The memoized function.
+        maxsize (int): Maximum number of results kept.
+        max_key_length (int): Longer arguments bypass the cache, so that
+            e.g. a whole document is never kept in memory.
+        enabled (bool): If False, the function is called directly.
+        hits, misses, evictions (int): Counters since the last clear().
+
+    """
+
+    def __init__(self, function, maxsize=4096, max_key_length=1024):
+        """Initialises an empty cache in front of function."""
+        self.function = function
+        self.maxsize = maxsize
+        self.max_key_length = max_key_length
+        self.enabled = True
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, key):
+        """Returns function(key), computing it only on a cache miss."""
+        if not self.enabled or len(key) > self.max_key_length:
+            return self.function(key)
+
+        with self._lock:
+            try:
+                value = self._cache[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self.function(key)
+
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def resize(self, maxsize):
+        """Changes the size of the cache, evicting results if needed."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._cache) > maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Returns the counters and the size of the cache as a dict."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._cache),
+                'maxsize': self.maxsize,
+            }
@@ -0,0 +1,108 @@
+import os
+from collections import namedtuple
+
+
+MERGE_POLICIES = ['first', 'newest', 'rename', 'error']
+
+MergeReport = namedtuple('MergeReport', ['entries', 'duplicates', 'renamed'])
+MergeReport.__doc__ = """Summary of BibTexMagic.merge.
+
+    entries: Number of entries written.
+    duplicates: Keys found more than once, in the order they were found.
+    renamed: (old key, new key) pairs of the renamed entries.
+
+"""
+
+
+def merge(parser, files, out, policy='first', encoding="utf-8"):
+    """
+    Streams the entries of several BibTeX files into a single one, see
+    BibTexMagic.merge.
+
+    Only the citation keys are kept in memory: the entries are parsed
+    with parser.iter_entries and written with parser.iter_bibtex one at
+    a time. The 'newest' policy reads the files twice, first parsing only
+    the keys to find the winning entries.
+
+    Raises:
+        ValueError if the policy is not supported, if 'newest' is given
+            buffers, or if a key is taken and the policy is 'error'.
+
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Merge policy {policy} is not supported.")
+    if policy == 'newest' and any(type(f) != str for f in files):
+        raise ValueError("Need to provide filenames to use " +
+                         "the 'newest' policy!")
+
+    if type(out) == str:
+        with open(out, "w", encoding=encoding) as fp:
+            return merge(parser, files, fp, policy, encoding)
+
+    duplicates = []
+    renamed = []
+    if policy == 'newest':
+        entries = _newest_entries(parser, files, encoding, duplicates)
+    else:
+        entries = _unique_entries(parser, files, encoding, policy,
+                                  duplicates, renamed)
+
+    count = 0
+    for chunk in parser.iter_bibtex(entries):
+        out.write(chunk)
+        count += 1
+
+    return MergeReport(count, duplicates, renamed)
+
+
+def _unique_entries(parser, files, encoding, policy, duplicates, renamed):
+    """Yields the entries of all the files, applying the 'first',
+    'rename' or 'error' policy to the duplicate keys."""
+    keys = set()
+    for filename_or_buffer in files:
+        for entry in parser.iter_entries(filename_or_buffer, encoding):
+            key = entry.key
+            if key in keys:
+                if policy == 'error':
+                    raise ValueError(f"Duplicate key {key}.")
+
+                duplicates.append(key)
+                if policy == 'first':
+                    continue
+
+                suffix = 2
+                while f"{key}_{suffix}" in keys:
+                    suffix += 1
+                entry.key = f"{key}_{suffix}"
+                renamed.append((key, entry.key))
+
+            keys.add(entry.key)
+            yield entry
+
+
+def _newest_entries(parser, files, encoding, duplicates):
+    """Yields, for every key, the entry of the most recently modified
+    file, or the last one if several files are as recent."""
+    # Maps every key to the (mtime, file number, position) of its winner.
+    # Only the keys are parsed in this pass.
+    winners = {}
+    lazy, parser.lazy = parser.lazy, True
+    try:
+        for number, filename in enumerate(files):
+            mtime = os.stat(filename).st_mtime_ns
+            for position, entry in enumerate(
+                    parser.iter_entries(filename, encoding)):
+                winner = winners.get(entry.key)
+                if winner is not None:
+                    duplicates.append(entry.key)
+                    if winner[0] > mtime:
+                        continue
+                winners[entry.key] = (mtime, number, position)
+    finally:
+        parser.lazy = lazy
+
+    for number, filename in enumerate(files):
+        for position, entry in enumerate(
+                parser.iter_entries(filename, encoding)):
+            if winners[entry.key][1:] == (number, position):
+                yield entry
@@ -0,0 +1,215 @@
+import gc
+import hashlib
+import os
+import pickle
+import stat
+import struct
+import tempfile
+import zlib
+from contextlib import contextmanager
+
+from .entry import BibTexEntry
+from .fields.field import BibTexField
+
+
+SNAPSHOT_VERSION = 1
+
+_MAGIC = b"BTMSNAP\0"
+
+# magic, version, file size, file mtime (ns), file sha256, payload length,
+# payload crc32
+_HEADER = struct.Struct("<8sHQq32sQI")
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class Snapshot():
+    """
+    Binary snapshot of the entries parsed from a BibTeX file.
+
+    A snapshot is a fixed-size header followed by the entries pickled as
+    plain (entry_type, key, ((field_class, name, value), ...)) records,
+    which pickle and unpickle faster than the objects themselves. The
+    header records the format version and the size, modification time and
+    SHA-256 of the parsed file, as well as the length and CRC-32 of the
+    payload. A snapshot is reused when the size and the modification
+    time of the file match, or when its content hashes the same (e.g.
+    after a checkout touched it). Anything else, including a truncated or
+    corrupt snapshot, is a miss and the file is parsed again.
+
+    The snapshot file name depends on the path of the parsed file, its
+    encoding and the registered field classes, so that a change in any of
+    them does not restore differently parsed entries.
+
+    Snapshots are pickles, and unpickling runs arbitrary code: the cache
+    directory has to be trusted, i.e. writable by the current user only.
+    Snapshots owned by another user, or writable by the group or by
+    others, are refused and treated as a miss.
+
+    Members:
+        path (str): Path of the snapshot file.
+        filename (str): Path of the BibTeX file.
+
+    """
+
+    def __init__(self, cache_dir, filename, encoding="utf-8"):
+        """Locates the snapshot of a file in cache_dir."""
+        self.filename = filename
+        self.path = os.path.join(cache_dir,
+                                 _snapshot_name(filename, encoding))
+
+        file_stat = os.stat(filename)
+        self._size = file_stat.st_size
+        self._mtime = file_stat.st_mtime_ns
+        self._digest = None
+
+    def load(self):
+        """
+        Restores the entries from the snapshot without parsing them.
+
+        On a miss the file is hashed, so that a following save records the
+        content which is about to be parsed.
+
+        Returns:
+            list: BibTexEntry objects in the order of the file, or None if
+                there is no valid snapshot.
+
+        """
+        try:
+            with open(self.path, "rb") as snapshot:
+                if _trusted(os.fstat(snapshot.fileno())):
+                    header = snapshot.read(_HEADER.size)
+                    payload = self._check(header, snapshot)
+                    if payload is not None:
+                        return _restore(payload)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            pass
+
+        self.digest()
+        return None
+
+    def save(self, entries):
+        """
+        Writes the entries to the snapshot.
+
+        The snapshot is written to a temporary file first and moved in
+        place, so that concurrent readers never see a partial snapshot.
+
+        Args:
+            entries (list): Parsed BibTexEntry objects.
+
+        """
+        payload = _dump(entries)
+        header = _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, self._size,
+                              self._mtime, self.digest(), len(payload),
+                              zlib.crc32(payload))
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as snapshot:
+                snapshot.write(header)
+                snapshot.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def digest(self):
+        """Returns the SHA-256 of the file, computed once."""
+        if self._digest is None:
+            sha = hashlib.sha256()
+            with open(self.filename, "rb") as bibfile:
+                for block in iter(lambda: bibfile.read(_HASH_BLOCK_SIZE),
+                                  b""):
+                    sha.update(block)
+            self._digest = sha.digest()
+
+        return self._digest
+
+    def _check(self, header, snapshot):
+        """Returns the payload if the snapshot is valid for the file."""
+        if len(header) != _HEADER.size:
+            return None
+
+        magic, version, size, mtime, digest, length, crc = \
+            _HEADER.unpack(header)
+        if (magic != _MAGIC or version != SNAPSHOT_VERSION or
+                size != self._size):
+            return None
+        if mtime != self._mtime and digest != self.digest():
+            return None
+
+        payload = snapshot.read(length + 1)
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return None
+
+        return payload
+
+
+def _trusted(snapshot_stat):
+    """Returns True if a snapshot is owned by the current user and cannot
+    be written by anybody else."""
+    if snapshot_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return False
+
+    # Windows has no user ids.
+    getuid = getattr(os, "getuid", None)
+    return getuid is None or snapshot_stat.st_uid == getuid()
+
+
+def _snapshot_name(filename, encoding):
+    """Returns the name of the snapshot of a file."""
+    field_classes = BibTexField._FIELD_CLASSES or BibTexField._field_classes()
+    fields = sorted(
+        (name, "" if cls is None else cls.__module__ + "." + cls.__qualname__)
+        for name, cls in field_classes.items())
+
+    key = repr((os.path.abspath(filename), encoding.lower(), fields))
+    return hashlib.sha256(key.encode()).hexdigest()[:32] + ".snapshot"
+
+
+@contextmanager
+def _gc_paused():
+    """Pauses the cyclic garbage collector, which would otherwise walk
+    all the containers allocated so far over and over again while
+    millions of them are created."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _dump(entries):
+    """Pickles the entries as plain records."""
+    with _gc_paused():
+        records = [
+            (entry.entry_type, entry.key,
+             tuple((type(field), field.name, field.value)
+                   for field in entry.fields))
+            for entry in entries]
+        return pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+
+
+def _restore(payload):
+    """Rebuilds the entries from pickled records without parsing them."""
+    new = object.__new__
+    entries = []
+    with _gc_paused():
+        for entry_type, key, fields_state in pickle.loads(payload):
+            fields = []
+            for field_class, name, value in fields_state:
+                field = new(field_class)
+                field.__setstate__((name, value))
+                fields.append(field)
+
+            entry = new(BibTexEntry)
+            entry.__setstate__((entry_type, key, fields))
+            entries.append(entry)
+
+    return entries
@@ -0,0 +1,156 @@
+import heapq
+import pickle
+import tempfile
+
+from .helper import fold
+
+
+# Ranks of the entries missing a sorted field, which sort them last.
+_MISSING = 2
+
+
+def _field_key(entry, name):
+    """Returns the (rank, value) sort key of a single field of an entry."""
+    if name == 'key':
+        return (0, entry.key)
+    if name == 'entry_type':
+        return (0, entry.entry_type)
+
+    field = entry.get_field(name)
+    if field is None:
+        return (_MISSING, "")
+
+    if name in ('author', 'editor'):
+        return (0, tuple((fold(last), fold(first))
+                         for last, jr, first in field.value))
+
+    value = field.to_string().strip()
+    if name == 'year' and value.isdigit():
+        return (0, int(value))
+
+    # Non-numeric years sort after the numeric ones.
+    return (1 if name == 'year' else 0, fold(value))
+
+
+def sort_key(entry, by, reverse=False):
+    """
+    Returns the sort key of an entry, computed once per entry.
+
+    Authors and editors are compared by their folded last and first
+    names, numeric years as numbers, and other fields as folded strings
+    (see helper.fold), so that accents and case do not change the order.
+    Entries missing a field sort after the entries having it, and
+    non-numeric years after the numeric ones, in both directions.
+
+    Args:
+        entry (BibTexEntry): Entry to be sorted.
+        by (list): Field names, 'key' or 'entry_type', the first one
+            being the most significant.
+        reverse (bool): If True, the key is meant for a descending sort,
+            the ranks of the missing fields and non-numeric years are
+            then negated to keep them last.
+
+    Returns:
+        tuple: A key comparable with the keys of other entries.
+
+    """
+    keys = [_field_key(entry, name) for name in by]
+    if reverse:
+        keys = [(-rank, value) for rank, value in keys]
+
+    return tuple(keys)
+
+
+def external_sort(entries, by, reverse=False, run_size=100000,
+                  run_bytes=None):
+    """
+    Sorts entries which do not fit in memory.
+
+    Runs of entries are sorted in memory and spilled to temporary files,
+    which are then merged. Only one run (plus one entry per spilled run)
+    is held in memory at a time. The sort is stable.
+
+    A run ends after run_size entries, or, if run_bytes is given, once
+    the sizes of its entries add up to run_bytes. The memory of a run
+    then stays bounded whatever the size of the entries, e.g. with long
+    abstracts.
+
+    Args:
+        entries: An iterable of BibTexEntry objects, e.g.
+            BibTexMagic.iter_entries(filename), or of (entry, size) pairs
+            if run_bytes is given, size being e.g. the length of the
+            entry text.
+        by (list): Field names, see sort_key.
+        reverse (bool): If True, the entries are sorted descending.
+        run_size (int): Maximal number of entries sorted in memory at
+            once.
+        run_bytes (int): Maximal total size of the entries sorted in
+            memory at once.
+
+    Yields:
+        BibTexEntry: The sorted entries.
+
+    """
+    if run_bytes is None:
+        entries = ((entry, 0) for entry in entries)
+
+    # The position breaks the ties, keeping equal entries in order.
+    sign = -1 if reverse else 1
+    runs = []
+    try:
+        run = []
+        size = 0
+        for position, (entry, entry_size) in enumerate(entries):
+            run.append((sort_key(entry, by, reverse), sign * position,
+                        entry))
+            size += entry_size
+            if len(run) == run_size or (run_bytes is not None
+                                         and size >= run_bytes):
+                runs.append(_spill(run, reverse))
+                run = []
+                size = 0
+
+        run.sort(key=_record_key, reverse=reverse)
+        if not runs:
+            for record in run:
+                yield record[2]
+            return
+
+        runs.append(_spill(run, reverse))
+        del run
+
+        for record in heapq.merge(*map(_load, runs), key=_record_key,
+                                  reverse=reverse):
+            yield record[2]
+    finally:
+        for run_file in runs:
+            run_file.close()
+
+
+def _record_key(record):
+    """Returns the (sort key, position) of a run record."""
+    return record[0], record[1]
+
+
+def _spill(run, reverse):
+    """Sorts a run and writes it to a temporary file."""
+    run.sort(key=_record_key, reverse=reverse)
+
+    # Records are pickled one by one, so that the pickler does not keep
+    # every pickled object (e.g. the persons) until the end of the run.
+    run_file = tempfile.TemporaryFile()
+    for record in run:
+        pickle.dump(record, run_file, pickle.HIGHEST_PROTOCOL)
+    run.clear()
+
+    return run_file
+
+
+def _load(run_file):
+    """Yields the records of a spilled run."""
+    run_file.seek(0)
+    while True:
+        try:
+            yield pickle.load(run_file)
+        except EOFError:
+            return
@@ -0,0 +1,195 @@
+import os
+import pickle
+import tempfile
+from bisect import bisect_left
+from functools import reduce
+
+from .helper import fold_words
+
+
+TEXT_INDEX_VERSION = 1
+
+
+class TextIndex():
+    """
+    Inverted index of the words in the titles, authors and journals of
+    a bibliography.
+
+    Words are folded (LaTeX macros converted, accents stripped and
+    casefolded, see helper.fold_words), so that e.g. 'Erd\\H{o}s', 'Erdős'
+    and 'ERDOS' match each other. Every word maps to the set of the
+    citation keys of the entries containing it, and the sorted vocabulary
+    answers the prefix queries with a binary search. The vocabulary is
+    only sorted again by the first prefix query after words were added
+    or removed, so that indexing stays linear in the number of words.
+
+    Members:
+        fields (tuple): Names of the indexed fields.
+
+    """
+
+    FIELDS = ('title', 'author', 'journal')
+
+    def __init__(self, fields=FIELDS):
+        """Initialises an empty index over the given fields."""
+        self.fields = tuple(fields)
+
+        self._postings = {}
+        self._words = {}
+        # Sorted words, or None if they changed since the last sort.
+        self._vocabulary = []
+        self._order = {}
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, key):
+        return key in self._words
+
+    def add(self, entry):
+        """Indexes an entry, replacing the entry indexed under its key."""
+        key = entry.key
+        if key in self._words:
+            self.remove(entry)
+
+        words = frozenset(self._entry_words(entry))
+        self._words[key] = words
+        self._order[key] = self._counter
+        self._counter += 1
+
+        postings = self._postings
+        for word in words:
+            keys = postings.get(word)
+            if keys is None:
+                keys = postings[word] = set()
+                self._vocabulary = None
+            keys.add(key)
+
+    def remove(self, entry):
+        """Removes the entry indexed under the key of an entry."""
+        key = entry.key
+        del self._order[key]
+
+        for word in self._words.pop(key):
+            keys = self._postings[word]
+            keys.discard(key)
+            if not keys:
+                del self._postings[word]
+                self._vocabulary = None
+
+    def search(self, query, mode='and', prefix=False):
+        """
+        Finds the entries containing the words of a query.
+
+        Args:
+            query: A string, or a list of strings, folded into words.
+            mode (str): 'and' finds the entries containing all the words,
+                'or' the entries containing any of them.
+            prefix (bool): If True, every word of the query also matches
+                the words it is a prefix of, e.g. 'stoch' --> 'stochastic'.
+
+        Returns:
+            list: Citation keys of the matching entries, in the order
+                they were added.
+
+        Raises:
+            ValueError if the mode is not supported.
+
+        """
+        if mode not in ('and', 'or'):
+            raise ValueError(f"Search mode {mode} is not supported.")
+        if isinstance(query, str):
+            query = [query]
+
+        words = [word for text in query for word in fold_words(text)]
+        if not words:
+            return []
+
+        matches = [self._prefix_keys(word) if prefix
+                   else self._postings.get(word, set())
+                   for word in words]
+
+        if mode == 'and':
+            matches.sort(key=len)
+            keys = reduce(set.intersection, matches[1:], set(matches[0]))
+        else:
+            keys = set().union(*matches)
+
+        return sorted(keys, key=self._order.__getitem__)
+
+    def save(self, path):
+        """
+        Writes the index to a file.
+
+        The index is written to a temporary file first and moved in
+        place, so that concurrent readers never see a partial index.
+
+        """
+        state = (TEXT_INDEX_VERSION, self.fields, self._words,
+                 self._postings, self._sorted_vocabulary(), self._order,
+                 self._counter)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as index_file:
+                pickle.dump(state, index_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def load(path):
+        """
+        Reads an index written by save.
+
+        Raises:
+            ValueError if the file was written by another version.
+
+        """
+        with open(path, "rb") as index_file:
+            state = pickle.load(index_file)
+
+        if not isinstance(state, tuple) or state[0] != TEXT_INDEX_VERSION:
+            raise ValueError(f"{path} is not a text index of version " +
+                             str(TEXT_INDEX_VERSION))
+
+        index = TextIndex(state[1])
+        (index._words, index._postings, index._vocabulary, index._order,
+         index._counter) = state[2:]
+
+        return index
+
+    def _prefix_keys(self, prefix):
+        """Returns the keys of the entries with a word starting with
+        prefix."""
+        vocabulary = self._sorted_vocabulary()
+        keys = set()
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            word = vocabulary[i]
+            if not word.startswith(prefix):
+                break
+            keys |= self._postings[word]
+
+        return keys
+
+    def _sorted_vocabulary(self):
+        """Returns the sorted words, sorting them if they changed."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        return self._vocabulary
+
+    def _entry_words(self, entry):
+        """Yields the folded words of the indexed fields of an entry."""
+        for field in entry.fields:
+            if field.name not in self.fields:
+                continue
+
+            if field.name in ('author', 'editor'):
+                for last, jr, first in field.value:
+                    yield from fold_words(" ".join((first, last, jr)))
+            else:
+                yield from fold_words(field.to_string())
@@ -0,0 +1,56 @@
+import io
+import unittest
+from unittest import mock
+
+from bibtexmagic.benchmarks import corpus, run
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+
+class TestBenchmarks(unittest.TestCase):
+    def generate(self, entries, seed):
+        fp = io.StringIO()
+        corpus.write_corpus(fp, entries, seed)
+        return fp.getvalue()
+
+    def test_corpus(self):
+        bib = self.generate(50, 1)
+
+        self.assertEqual(bib, self.generate(50, 1))
+        self.assertNotEqual(bib, self.generate(50, 2))
+
+        parser = BibTexMagic()
+        parser.parse_bib(io.StringIO(bib))
+        self.assertEqual(len(parser.entries), 50)
+        self.assertEqual(parser.entries[0].key, "key0000000")
+
+    def test_compare(self):
+        baseline = {"parse_bib": {"seconds": 1.0},
+                    "to_bibtex": {"seconds": 1.0}}
+        results = {"parse_bib": {"seconds": 1.05},
+                   "to_bibtex": {"seconds": 1.5},
+                   "title_field": {"seconds": 9.0}}
+
+        self.assertEqual(run.compare(results, baseline, 0.1),
+                         [("to_bibtex", 1.0, 1.5, 1.5)])
+        self.assertEqual(run.compare(results, baseline, 0.6), [])
+
+    def test_only_prepares_selected(self):
+        with mock.patch.object(BibTexMagic, "parse_bib") as parse_bib:
+            results = run.run_benchmarks("missing.bib", 10, repeat=1,
+                                         only=["title_field"])
+            parse_bib.assert_not_called()
+
+        self.assertEqual(list(results), ["title_field"])
+
+    def test_clear_caches(self):
+        parser = BibTexMagic()
+        parser.parse_bib(io.StringIO(self.generate(5, 1)))
+        self.assertTrue(len(BibTexMagic.NAMES))
+
+        run._clear_caches()
+
+        self.assertEqual(len(BibTexMagic.NAMES), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+class TestColumns(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.parser.parse_bib(io.StringIO(
+            "@article{a1, author = {First Last and Other One},\n"
+            "  year = {2001}}\n"
+            "@book{b1, editor = {Ed Itor}, title = {Book}}\n"
+            "@article{a2, author = {Last, Jr, First}, year = {2002},\n"
+            "  pages = {1-2}}\n"))
+        self.table = self.parser.to_columns()
+
+    def test_columns(self):
+        table = self.table
+
+        self.assertEqual(table.length, 3)
+        self.assertEqual(table.columns['key'], ["a1", "b1", "a2"])
+        self.assertEqual(table.columns['entry_type'],
+                         ["article", "book", "article"])
+        self.assertEqual(table.columns['year'], ["2001", None, "2002"])
+        self.assertEqual(table.masks['year'], bytearray([1, 0, 1]))
+        self.assertEqual(table.columns['pages'], [None, None, "1--2"])
+        self.assertEqual(table.masks['pages'], bytearray([0, 0, 1]))
+        self.assertEqual(table.columns['title'], [None, "Book", None])
+
+        offsets, last, jr, first = table.names['author']
+        self.assertEqual(list(offsets), [0, 2, 2, 3])
+        self.assertEqual(last, ["Last", "One", "Last"])
+        self.assertEqual(jr, ["", "", "Jr"])
+        self.assertEqual(first, ["First", "Other", "First"])
+        self.assertEqual(list(table.names['editor'][0]), [0, 0, 1, 1])
+
+    def test_streamed(self):
+        fixture_file = io.StringIO(self.parser.to_bibtex())
+        table = self.parser.to_columns(self.parser.iter_entries(fixture_file))
+
+        self.assertEqual(table.columns, self.table.columns)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_to_numpy(self):
+        arrays = self.table.to_numpy()
+
+        self.assertEqual(arrays['year.mask'].tolist(), [True, False, True])
+        self.assertEqual(arrays['author.offsets'].tolist(), [0, 2, 2, 3])
+        arrays['year.mask'][0] = False
+        self.assertEqual(self.table.masks['year'][0], 0)
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_to_pandas(self):
+        frame = self.table.to_pandas()
+        names = self.table.names_to_pandas()
+
+        self.assertEqual(list(frame['key']), ["a1", "b1", "a2"])
+        self.assertEqual(list(names['row']), [0, 0, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic import dedup
+
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.parser.parse_bib(io.StringIO(
+            "@article{a1, author = {Paul Erd\\H{o}s and Other One},\n"
+            "  title = {On the {M}arkov property of random graphs},\n"
+            "  year = {1960}}\n"
+            "@article{a2, author = {Erdos, P.},\n"
+            "  title = {ON THE MARKOV PROPERTY OF RANDOM GRAPHS},\n"
+            "  year = {1960}}\n"
+            "@article{b1, author = {Someone Else},\n"
+            "  title = {On the Markov property of random trees},\n"
+            "  year = {1961}}\n"
+            "@article{a3, author = {Paul Erd{\\H{o}}s},\n"
+            "  title = {On the Markov property of random graphs},\n"
+            "  year = {1961}}\n"
+            "@book{c1, author = {Paul Erdos}, year = {1960}}\n"))
+
+    def test_normalize(self):
+        self.assertEqual(dedup.normalize("Erd\\H{o}s, {P}aul"),
+                         ["erdos", "paul"])
+
+    def test_find_duplicates(self):
+        clusters = self.parser.find_duplicates()
+
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual([e.key for e in clusters[0].entries],
+                         ["a1", "a2", "a3"])
+        scores = {(a.key, b.key): score
+                  for a, b, score in clusters[0].pairs}
+        self.assertAlmostEqual(scores["a1", "a2"], 1.0)
+        self.assertAlmostEqual(scores["a1", "a3"], 0.85)
+
+    def test_blocks(self):
+        self.assertEqual(self.parser.find_duplicates(max_block_size=1), [])
+        self.assertEqual(len(self.parser.find_duplicates(threshold=0.5)[0]
+                             .entries), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
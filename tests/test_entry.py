@@ -33,6 +33,21 @@ class TestEntry(unittest.TestCase):
         self.assertEqual(entry.entry_type, self.entry_type)
         self.assertEqual(len(entry.fields), 2)
 
+    def test_parse_entry_lazy(self):
+        entry = BibTexEntry(self.test_entry, lazy=True)
+
+        self.assertEqual(entry.key, self.entry_key)
+        self.assertEqual(entry.entry_type, self.entry_type)
+        self.assertIsNotNone(entry._raw)
+
+        journal = entry.get_field(self.field_name2)
+
+        self.assertEqual(len(entry.fields), 2)
+        self.assertEqual(journal.value, self.field_val2)
+        self.assertIsNotNone(entry.get_field(self.field_name1)._raw)
+        self.assertEqual(entry.to_dict(),
+                         BibTexEntry(self.test_entry).to_dict())
+
 
 if __name__ == "__main__":
     unittest.main()
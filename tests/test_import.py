@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+
+class TestImport(unittest.TestCase):
+    """Guards the cost of importing the package, e.g. in CLI tools."""
+
+    # Generous, to stay reliable on slow machines. A typical import takes
+    # ~25 ms, building the converter alone adds ~5 ms.
+    MAX_IMPORT_US = 150000
+
+    def run_python(self, code):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+
+    def test_import_is_lazy(self):
+        module = BibTexMagic.__module__
+        package = module.rsplit(".", 1)[0]
+
+        result = self.run_python(
+            f"import sys, {module}\n"
+            f"print({package}.latextouni._CONVERTER is None)\n"
+            "print('concurrent.futures' in sys.modules)\n")
+
+        self.assertEqual(result.stdout.split(), ["True", "False"])
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     "-X importtime needs Python 3.7")
+    def test_import_time(self):
+        module = BibTexMagic.__module__
+
+        result = self.run_python(f"import {module}")
+
+        # Lines read 'import time: self [us] | cumulative | name'
+        cumulative = None
+        for line in result.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative = int(parts[1])
+
+        self.assertIsNotNone(cumulative)
+        self.assertLess(cumulative, self.MAX_IMPORT_US)
+
+
+if __name__ == "__main__":
+    unittest.main()
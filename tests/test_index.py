@@ -0,0 +1,73 @@
+import io
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.parser.parse_bib(io.StringIO(
+            "@article{a1, author = {First von Last2 and Other One},\n"
+            "  journal = {J. Test}, year = {2005}}\n"
+            "@article{a2, author = {Last2, First}, journal = {J. Test},\n"
+            "  year = {2016}}\n"
+            "@book{b1, author = {First Last2}, year = {2010}}\n"
+            "@article{a3, author = {Someone Else}, journal = {j. test},\n"
+            "  year = {2010}}\n"
+            "@book{b2, editor = {Last2, First and Someone Else},\n"
+            "  year = {2012}}\n"))
+
+    def keys(self, entries):
+        return [e.key for e in entries]
+
+    def test_query(self):
+        self.assertEqual(self.keys(self.parser.query(author="last2")),
+                         ["a1", "a2", "b1"])
+        self.assertEqual(self.keys(self.parser.query(author="von Last2")),
+                         ["a1"])
+        self.assertEqual(self.keys(self.parser.query(journal="J. TEST")),
+                         ["a1", "a2", "a3"])
+        self.assertEqual(self.keys(self.parser.query(entry_type="book")),
+                         ["b1", "b2"])
+        self.assertEqual(self.keys(self.parser.query(year=2010)),
+                         ["b1", "a3"])
+        self.assertEqual(self.keys(self.parser.query(author="Else")),
+                         ["a3"])
+
+    def test_query_combined(self):
+        found = self.parser.query(author="Last2", year=(2005, 2015),
+                                  entry_type="article")
+
+        self.assertEqual(self.keys(found), ["a1"])
+        self.assertEqual(
+            self.keys(self.parser.query(year=(2006, None))),
+            ["a2", "b1", "a3", "b2"])
+        self.assertEqual(self.parser.query(author="Nobody"), [])
+
+    def test_people(self):
+        first_last2 = ("Last2", "", "First")
+
+        self.assertEqual(self.keys(self.parser.works(first_last2)),
+                         ["a2", "b1", "b2"])
+        self.assertIs(self.parser["a2"].get_field("author").value[0],
+                      self.parser["b2"].get_field("editor").value[0])
+        self.assertEqual(
+            self.parser.coauthors(("von Last2", "", "First")),
+            {("One", "", "Other"): 1})
+        self.assertEqual(self.parser.coauthors(first_last2), {})
+
+    def test_index_follows_mutations(self):
+        self.parser.build_index()
+
+        removed = self.parser.remove_entry("a1")
+        self.assertEqual(self.keys(self.parser.query(year=(None, 2005))),
+                         [])
+
+        self.parser.add_entry(removed)
+        self.assertEqual(self.keys(self.parser.query(author="One")),
+                         ["a1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
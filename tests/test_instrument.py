@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from bibtexmagic.bibtexmagic import latextouni
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic.entry import BibTexEntry
+from bibtexmagic.bibtexmagic.fields.field import BibTexField
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.fixture_file = os.path.join(
+                os.path.dirname(__file__), "fixtures", "test_bib.bib")
+        BibTexMagic.LATEX_TO_UNICODE_CACHE.clear()
+
+    def test_stats(self):
+        events = []
+        with BibTexMagic.instrument(
+                lambda phase, seconds: events.append(phase)) as stats:
+            self.parser.parse_bib(self.fixture_file)
+
+        self.assertEqual(stats.entries, 3)
+        self.assertEqual(stats.fields["author"], 3)
+        self.assertEqual(stats.fields["year"], 3)
+        self.assertEqual(stats.calls["title"], 3)
+        self.assertEqual(stats.calls["get_parentheses"], 3)
+        self.assertGreater(stats.calls["split_entries"], 3)
+        self.assertGreater(stats.conversions, 0)
+        self.assertGreater(stats.scanned, 200)
+        self.assertTrue(all(t >= 0 for t in stats.timings.values()))
+        self.assertEqual(len(events), sum(stats.calls.values()))
+        self.assertEqual(stats.to_dict()["entries"], 3)
+
+    def test_caches_kept(self):
+        cache = BibTexMagic.LATEX_TO_UNICODE_CACHE
+        function = cache.function
+
+        with BibTexMagic.instrument() as stats:
+            self.assertIs(latextouni.LATEX_TO_UNICODE_CACHE, cache)
+            self.parser.parse_bib(self.fixture_file)
+            BibTexMagic().parse_bib(self.fixture_file)
+            cache_stats = BibTexMagic.cache_stats()["latex_to_unicode"]
+
+        self.assertEqual(stats.calls["latex_to_unicode"],
+                         cache_stats["misses"])
+        self.assertGreater(cache_stats["hits"], 0)
+        self.assertIs(cache.function, function)
+
+    def test_restored(self):
+        parse_entry = BibTexEntry.parse_entry
+        create_field = vars(BibTexField)["create_field"]
+
+        with BibTexMagic.instrument() as stats:
+            with self.assertRaises(RuntimeError):
+                with BibTexMagic.instrument():
+                    pass
+
+        self.assertIs(BibTexEntry.parse_entry, parse_entry)
+        self.assertIs(vars(BibTexField)["create_field"], create_field)
+
+        self.parser.parse_bib(self.fixture_file)
+        self.assertEqual(stats.entries, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from bibtexmagic.bibtexmagic import lexer
+
+
+class TestLexer(unittest.TestCase):
+    def test_match_brace(self):
+        text = "a{b{c}{d}e}f}"
+
+        self.assertEqual(lexer.match_brace(text, 1), 10)
+        self.assertEqual(lexer.match_brace(text, 3), 5)
+
+        with self.assertRaises(IndexError):
+            lexer.match_brace("{{}", 0)
+
+    def test_scan_entry(self):
+        text = ('article{ key1 ,\n'
+                '  title = {A {B} c},\n'
+                '  journal = "J {"} x",\n'
+                '  year = 1965\n'
+                '} trailing')
+
+        spans = lexer.scan_entry(text)
+
+        def cut(span):
+            return text[span[0]:span[1]]
+
+        self.assertEqual(cut(spans.entry_type), "article")
+        self.assertEqual(cut(spans.key), "key1")
+        self.assertEqual(
+            [(cut(f[:2]), cut(f[2:])) for f in spans.fields],
+            [("title", "A {B} c"), ("journal", 'J {"} x'),
+             ("year", "1965")])
+        self.assertEqual(text[spans.end:], " trailing")
+
+    def test_entry_spans(self):
+        text = ("% comment @ not an entry\n"
+                "@a{k1, t = {x@y}}\n"
+                "junk @b{k2}")
+
+        spans = list(lexer.iter_entry_spans(text))
+
+        self.assertEqual([text[s:e] for s, e in spans],
+                         ["@a{k1, t = {x@y}}", "@b{k2}"])
+
+    def test_split_entries(self):
+        text = "@a{k1, t = {x}}\n% c\n@b{k2, t = {y}}"
+        chunks = [text[i:i+3] for i in range(0, len(text), 3)]
+
+        self.assertEqual(list(lexer.split_entries(chunks)),
+                         ["a{k1, t = {x}}", "b{k2, t = {y}}"])
+
+
+if __name__ == "__main__":
+    unittest.main()
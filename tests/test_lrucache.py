@@ -0,0 +1,84 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from bibtexmagic.bibtexmagic.lrucache import LRUCache
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def upper(s):
+            self.calls.append(s)
+            return s.upper()
+
+        self.cache = LRUCache(upper, maxsize=2, max_key_length=5)
+
+    def test_hits_and_evictions(self):
+        self.assertEqual(self.cache("a"), "A")
+        self.assertEqual(self.cache("b"), "B")
+        self.assertEqual(self.cache("a"), "A")
+        # "b" is now the least recently used one.
+        self.assertEqual(self.cache("c"), "C")
+        self.assertEqual(self.cache("b"), "B")
+
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+        self.assertEqual(self.cache.stats(), {
+            'hits': 1, 'misses': 4, 'evictions': 2,
+            'size': 2, 'maxsize': 2})
+
+    def test_bypass(self):
+        self.cache("toolong")
+        self.cache("toolong")
+        self.cache.enabled = False
+        self.cache("a")
+        self.cache("a")
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_resize_and_clear(self):
+        for s in "abc":
+            self.cache(s)
+        self.cache.resize(1)
+
+        self.assertEqual(self.cache.stats()['size'], 1)
+        self.assertEqual(self.cache.evictions, 2)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['misses'], 0)
+
+    def test_threads(self):
+        cache = LRUCache(str.upper, maxsize=50)
+        keys = [str(i % 80) for i in range(20000)]
+
+        with ThreadPoolExecutor(4) as executor:
+            values = list(executor.map(cache, keys, chunksize=100))
+
+        self.assertEqual(values, keys)
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], len(keys))
+        self.assertEqual(stats['size'], 50)
+        self.assertEqual(len(cache._cache), 50)
+
+    def test_parser_caches(self):
+        BibTexMagic.LATEX_TO_UNICODE_CACHE.clear()
+
+        BibTexMagic.latex_to_unicode(r"\'{o}")
+        BibTexMagic.latex_to_unicode(r"\'{o}")
+
+        stats = BibTexMagic.cache_stats()['latex_to_unicode']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        BibTexMagic.configure_cache(enabled=False)
+        try:
+            BibTexMagic.latex_to_unicode(r"\'{o}")
+            self.assertEqual(BibTexMagic.cache_stats()
+                             ['latex_to_unicode']['hits'], 1)
+        finally:
+            BibTexMagic.configure_cache(enabled=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
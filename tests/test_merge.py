@@ -0,0 +1,76 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+
+
+class TestMerge(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.parser = BibTexMagic()
+        self.files = [
+            self.write("old.bib", "@article{a, title = {Old A}}\n"
+                                  "@article{b, title = {B}}\n", 1000),
+            self.write("new.bib", "@article{a, title = {New A}}\n"
+                                  "@article{a_2, title = {C}}\n", 2000),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, bib, mtime):
+        filename = os.path.join(self.tmp, name)
+        with open(filename, "w") as bibfile:
+            bibfile.write(bib)
+        os.utime(filename, (mtime, mtime))
+        return filename
+
+    def merged(self, policy, files=None):
+        out = io.StringIO()
+        report = self.parser.merge(files or self.files, out, policy)
+
+        merged = BibTexMagic(duplicates='error')
+        merged.parse_bib(io.StringIO(out.getvalue()))
+        self.assertEqual(report.entries, len(merged.entries))
+        return report, {e.key: e.to_dict()["title"] for e in merged.entries}
+
+    def test_first(self):
+        report, titles = self.merged('first')
+
+        self.assertEqual(titles, {"a": "Old a", "b": "B", "a_2": "C"})
+        self.assertEqual(report.duplicates, ["a"])
+
+    def test_newest(self):
+        report, titles = self.merged('newest', self.files[::-1])
+        self.assertEqual(titles, {"a": "New a", "b": "B", "a_2": "C"})
+
+        with self.assertRaises(ValueError):
+            self.parser.merge([io.StringIO("")], io.StringIO(), 'newest')
+
+    def test_rename(self):
+        report, titles = self.merged('rename')
+
+        self.assertEqual(titles, {"a": "Old a", "b": "B", "a_2": "New a",
+                                  "a_2_2": "C"})
+        self.assertEqual(report.renamed, [("a", "a_2"), ("a_2", "a_2_2")])
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            self.merged('error')
+        with self.assertRaises(ValueError):
+            self.merged('unknown')
+
+    def test_output_file(self):
+        out = os.path.join(self.tmp, "merged.bib")
+        self.parser.merge(self.files, out)
+
+        merged = BibTexMagic()
+        merged.parse_bib(out)
+        self.assertEqual([e.key for e in merged.entries], ["a", "b", "a_2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
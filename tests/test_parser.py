@@ -1,8 +1,17 @@
+import asyncio
+import io
+import gc
 import unittest
 import os
 import json
+import tempfile
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic.entry import BibTexEntry
 
 
 class TestParser(unittest.TestCase):
@@ -24,3 +33,403 @@ class TestParser(unittest.TestCase):
         # Test if correct number of entries.
         self.assertEqual(len(bibtex_str.split("\n\n@")),
                          len(self.parser.entries) + 1)
+
+    def test_to_bibtex_converts_fields(self):
+        self.parser.parse_bib(self.fixture_file)
+
+        whole = self.parser.latex_to_unicode("".join(
+            "\n\n" + entry.to_bibtex() for entry in self.parser.entries))
+
+        self.assertEqual(self.parser.to_bibtex(), whole)
+        self.assertIn("\u03bb", whole)
+
+    def test_write_bibtex(self):
+        self.parser.parse_bib(self.fixture_file)
+        out = io.StringIO()
+
+        self.parser.write_bibtex(out)
+        self.assertEqual(out.getvalue(), self.parser.to_bibtex())
+
+        streamed = io.StringIO()
+        self.parser.write_bibtex(
+            streamed, self.parser.iter_entries(self.fixture_file))
+        self.assertEqual(streamed.getvalue(), out.getvalue())
+
+    def test_to_json(self):
+        bib = ('@article{key1, author = {von Last, Jr, First and Other},\n'
+               '  title = {A "quoted" {\\lambda} title},\n'
+               '  journal = {C:\\path}}\n'
+               '@book{key2, title = {Book}}\n')
+        self.parser.parse_bib(io.StringIO(bib))
+
+        entries = json.loads(self.parser.to_json())
+
+        self.assertEqual([e["key"] for e in entries], ["key1", "key2"])
+        self.assertEqual(entries[0]["entry_type"], "article")
+        fields = entries[0]["fields"]
+        self.assertEqual(fields["author"][0],
+                         {"last": "von Last", "jr": "Jr", "first": "First"})
+        self.assertEqual(fields["author"][1]["last"], "Other")
+        self.assertEqual(fields["title"], 'A "quoted" \u03bb title')
+        self.assertEqual(fields["journal"], "C:\\path")
+
+        out = io.StringIO()
+        self.parser.to_json(out)
+        self.assertEqual(json.loads(out.getvalue()), entries)
+        self.assertEqual(json.loads(self.parser.to_json(entries=[])), [])
+
+    def test_iter_json(self):
+        lines = list(self.parser.iter_json(
+            self.parser.iter_entries(self.fixture_file)))
+
+        self.assertEqual(len(lines), self.entries_count)
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+        self.assertEqual([json.loads(line)["key"] for line in lines],
+                         ["book_key", "article_key", "article_key2"])
+
+    def test_parse_parallel(self):
+        self.parser.BATCHES_PER_WORKER = 2
+        self.parser.parse_bib(self.fixture_file, workers=2)
+
+        serial = BibTexMagic()
+        serial.parse_bib(self.fixture_file)
+
+        self.assertEqual([e.key for e in self.parser.entries],
+                         [e.key for e in serial.entries])
+        self.assertEqual(self.parser.to_bibtex(), serial.to_bibtex())
+
+    def test_parse_lazy(self):
+        lazy = BibTexMagic(lazy=True)
+        lazy.parse_bib(self.fixture_file)
+        self.parser.parse_bib(self.fixture_file)
+
+        self.assertEqual(lazy.to_bibtex(), self.parser.to_bibtex())
+        self.assertEqual([e.to_dict() for e in lazy.entries],
+                         [e.to_dict() for e in self.parser.entries])
+
+    def test_memory_per_entry(self):
+        # Documented in BibTexEntry: ~1.5 kB for 7 short fields.
+        entry = ("@article{{key{0},\n"
+                 "  author = {{First Last and Second von Last and Third}},\n"
+                 "  title = {{A title with {{\\lambda}} {0}}},\n"
+                 "  journal = {{Journal}},\n  year = {{2001}},\n"
+                 "  volume = {{12}},\n  number = {{3}},\n"
+                 "  pages = {{1-{0}}}\n}}\n")
+        count = 2000
+        bib = io.StringIO("".join(entry.format(i) for i in range(count)))
+
+        # Only measure the entries, not the bounded conversion caches.
+        BibTexMagic.configure_cache(enabled=False)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self.parser.parse_bib(bib)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+            BibTexMagic.configure_cache(enabled=True)
+
+        self.assertEqual(len(self.parser.entries), count)
+        self.assertLess(used / count, 1600)
+
+    def test_key_index(self):
+        self.parser.parse_bib(self.fixture_file)
+
+        self.assertIn("article_key", self.parser)
+        self.assertNotIn("missing", self.parser)
+        self.assertIs(self.parser["book_key"], self.parser.entries[0])
+        self.assertIsNone(self.parser.get("missing"))
+        with self.assertRaises(KeyError):
+            self.parser["missing"]
+
+    def test_duplicate_keys(self):
+        bib = ("@article{key1, title = {First}}\n"
+               "@article{key2, title = {Other}}\n"
+               "@article{key1, title = {Second}}\n")
+
+        first = BibTexMagic(duplicates='first')
+        with self.assertWarns(UserWarning):
+            first.parse_bib(io.StringIO(bib))
+        last = BibTexMagic(duplicates='last')
+        last.parse_bib(io.StringIO(bib))
+
+        self.assertEqual([e.key for e in first.entries], ["key1", "key2"])
+        self.assertEqual(first["key1"].to_dict()["title"], "First")
+        self.assertEqual(first.duplicate_keys, ["key1"])
+        self.assertEqual([e.key for e in last.entries], ["key1", "key2"])
+        self.assertEqual(last["key1"].to_dict()["title"], "Second")
+        self.assertIs(last.entries[0], last["key1"])
+
+        with self.assertRaises(ValueError):
+            BibTexMagic(duplicates='error').parse_bib(io.StringIO(bib))
+
+    def test_positions_after_sort_and_remove(self):
+        last = BibTexMagic(duplicates='last')
+        last.parse_bib(io.StringIO("@article{c, year = {3}}\n"
+                                   "@article{a, year = {1}}\n"
+                                   "@article{b, year = {2}}\n"))
+        last.sort(by=['year'])
+        last.remove_entry("a")
+        last.parse_bib(io.StringIO("@article{c, year = {4}}\n"))
+
+        self.assertEqual([e.key for e in last.entries], ["b", "c"])
+        self.assertIs(last.entries[1], last["c"])
+        self.assertEqual(last["c"].to_dict()["year"], "4")
+
+    def test_add_remove_entry(self):
+        self.parser.parse_bib(self.fixture_file)
+
+        removed = self.parser.remove_entry("article_key")
+
+        self.assertNotIn("article_key", self.parser)
+        self.assertEqual(len(self.parser.entries), self.entries_count - 1)
+
+        self.assertTrue(self.parser.add_entry(removed))
+        self.assertIs(self.parser.entries[-1], removed)
+        self.assertIs(self.parser["article_key"], removed)
+
+        with self.assertRaises(KeyError):
+            self.parser.remove_entry("missing")
+
+    def test_parse_mmap(self):
+        self.parser.parse_bib(self.fixture_file)
+
+        for lazy in (False, True):
+            mapped = BibTexMagic(lazy=lazy)
+            mapped.parse_bib(self.fixture_file, use_mmap=True)
+
+            self.assertEqual(mapped.to_bibtex(), self.parser.to_bibtex())
+
+    def test_parse_encoding(self):
+        bib = "@article{key1, title = {Zo\u0142w}, journal = {Caf\u00e9}}"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "latin.bib")
+            with open(filename, "w", encoding="cp1250") as bibfile:
+                bibfile.write(bib)
+
+            for use_mmap in (False, True):
+                parser = BibTexMagic()
+                parser.parse_bib(filename, encoding="cp1250",
+                                 use_mmap=use_mmap)
+
+                self.assertEqual(parser["key1"].to_dict()["journal"],
+                                 "Caf\u00e9")
+
+        self.parser.parse_bib(io.BytesIO(bib.encode("cp1250")),
+                              encoding="cp1250")
+        self.assertEqual(self.parser["key1"].to_dict()["journal"],
+                         "Caf\u00e9")
+
+    def test_parse_utf16(self):
+        bib = ("@article{key1, title = {Zo\u0142w}}\n"
+               "@article{key2, journal = {Caf\u00e9}}\n")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "utf16.bib")
+            with open(filename, "w", encoding="utf-16") as bibfile:
+                bibfile.write(bib)
+
+            for workers in (None, 2):
+                parser = BibTexMagic()
+                parser.parse_bib(filename, workers=workers,
+                                 encoding="utf-16", use_mmap=True)
+
+                self.assertEqual([e.key for e in parser.entries],
+                                 ["key1", "key2"])
+                self.assertEqual(parser["key2"].to_dict()["journal"],
+                                 "Caf\u00e9")
+
+            changes = self.parser.reparse(filename, encoding="utf-16")
+            self.assertEqual(changes.added, ["key1", "key2"])
+            self.assertEqual(self.parser["key2"].to_dict()["journal"],
+                             "Caf\u00e9")
+
+    def test_reparse(self):
+        bib = ("@article{key1, title = {One}}\n"
+               "@article{key2, title = {Two}}\n"
+               "@article{key3, title = {Three}}\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.bib")
+            with open(filename, "w") as bibfile:
+                bibfile.write(bib)
+
+            changes = self.parser.reparse(filename)
+            self.assertEqual(changes.added, ["key1", "key2", "key3"])
+            self.parser.build_index()
+            key1 = self.parser["key1"]
+
+            with open(filename, "w") as bibfile:
+                bibfile.write(bib.replace("{Two}", "{Deux}")
+                              .replace("@article{key3, title = {Three}}",
+                                       "@book{key4, title = {Four}}"))
+
+            with mock.patch("bibtexmagic.bibtexmagic.bibtexmagic."
+                            "BibTexEntry", wraps=BibTexEntry) as entry:
+                changes = self.parser.reparse(filename)
+                self.assertEqual(entry.call_count, 2)
+
+        self.assertEqual(changes.added, ["key4"])
+        self.assertEqual(changes.removed, ["key3"])
+        self.assertEqual(changes.changed, ["key2"])
+        self.assertIs(self.parser["key1"], key1)
+        self.assertEqual([e.key for e in self.parser.entries],
+                         ["key1", "key2", "key4"])
+        self.assertEqual(self.parser["key2"].to_dict()["title"], "Deux")
+        self.assertEqual([e.key for e in self.parser.query(
+                         entry_type="article")], ["key1", "key2"])
+        self.assertEqual(self.parser.query(entry_type="book"),
+                         [self.parser["key4"]])
+
+    def test_reparse_after_parse_bib(self):
+        bib = ("@article{key1, title = {One}}\r\n"
+               "@article{key2, title = {Two}}\r\n"
+               "@article{key3, title = {Three}}\r\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.bib")
+            with open(filename, "w", newline="") as bibfile:
+                bibfile.write(bib)
+
+            for workers in (None, 2):
+                parser = BibTexMagic(track_changes=True)
+                parser.parse_bib(filename, workers=workers)
+                with open(filename, "w", newline="") as bibfile:
+                    bibfile.write(bib.replace("{Two}", "{Deux}"))
+
+                with mock.patch("bibtexmagic.bibtexmagic.bibtexmagic."
+                                "BibTexEntry", wraps=BibTexEntry) as entry:
+                    changes = parser.reparse(filename)
+                    self.assertEqual(entry.call_count, 1)
+
+                self.assertEqual(changes, ([], [], ["key2"]))
+                with open(filename, "w", newline="") as bibfile:
+                    bibfile.write(bib)
+
+    def test_fingerprints(self):
+        bib = ("@article{key1, title = {One}}\n"
+               "@article{key2, title = {Two}}\n"
+               "@article{key1, title = {Again}}\n")
+
+        self.parser.parse_bib(self.fixture_file)
+        self.assertEqual(self.parser._fingerprints, {})
+
+        parser = BibTexMagic(track_changes=True)
+        with self.assertWarns(UserWarning):
+            parser.parse_bib(io.StringIO(bib))
+        self.assertEqual(set(parser._fingerprints.values()),
+                         set(parser.entries))
+
+        parser.remove_entry("key1")
+        self.assertEqual(list(parser._fingerprints.values()),
+                         [parser["key2"]])
+        self.assertEqual(list(parser._fingerprint_keys), ["key2"])
+
+    def test_reparse_duplicate_error(self):
+        bib = ("@article{key1, title = {One}}\n"
+               "@article{key2, title = {Two}}\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.bib")
+            with open(filename, "w") as bibfile:
+                bibfile.write(bib)
+
+            parser = BibTexMagic(duplicates='error')
+            parser.reparse(filename)
+            parser.build_index()
+            parser.build_text_index()
+            entries = list(parser.entries)
+            fingerprints = dict(parser._fingerprints)
+
+            with open(filename, "w") as bibfile:
+                bibfile.write(bib + "@book{key1, title = {Three}}\n")
+            with self.assertRaises(ValueError):
+                parser.reparse(filename)
+
+        self.assertEqual(parser.entries, entries)
+        self.assertEqual(parser._fingerprints, fingerprints)
+        self.assertEqual(parser.query(entry_type="article"), entries)
+        self.assertEqual(len(parser.search("two")), 1)
+        self.assertIs(parser["key1"], entries[0])
+
+    def test_aparse(self):
+        with open(self.fixture_file, "rb") as bibfile:
+            bib = bibfile.read()
+        self.parser.CHUNK_SIZE = 7
+        self.parser.ENTRIES_PER_YIELD = 1
+
+        async def chunks():
+            for i in range(0, len(bib), 5):
+                yield bib[i:(i+5)]
+
+        async def parse(stream, executor=None):
+            ticks = []
+
+            async def tick():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.ensure_future(tick())
+            keys = [entry.key async for entry
+                    in self.parser.aparse(stream, executor=executor)]
+            ticker.cancel()
+            await asyncio.wait([ticker])
+            self.assertGreater(len(ticks), 1)
+            return keys
+
+        async def parse_reader(executor=None):
+            reader = asyncio.StreamReader()
+            reader.feed_data(bib)
+            reader.feed_eof()
+            return await parse(reader, executor)
+
+        def run(coroutine):
+            # asyncio.run needs Python 3.7.
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(coroutine)
+            finally:
+                loop.close()
+
+        expected = ["book_key", "article_key", "article_key2"]
+        self.assertEqual(run(parse(chunks())), expected)
+        self.assertEqual(run(parse_reader()), expected)
+        threads = set()
+
+        def entry(*args):
+            threads.add(threading.get_ident())
+            return BibTexEntry(*args)
+
+        with ThreadPoolExecutor(1) as executor, \
+                mock.patch("bibtexmagic.bibtexmagic.bibtexmagic."
+                           "BibTexEntry", side_effect=entry):
+            self.assertEqual(run(parse_reader(executor)), expected)
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_iter_entries(self):
+        self.parser.CHUNK_SIZE = 7
+
+        entries = list(self.parser.iter_entries(self.fixture_file))
+
+        self.assertEqual(len(entries), self.entries_count)
+        self.assertEqual([e.key for e in entries],
+                         ["book_key", "article_key", "article_key2"])
+        # Streaming does not store the entries.
+        self.assertEqual(len(self.parser.entries), 0)
+
+    def test_parse_buffer(self):
+        bib = (b"% A comment with an @ sign\n"
+               b"@article{key1, title = {Mail me@example.com}}\n"
+               b"@book{key2, title = {Zo\xc5\x82w}}")
+
+        self.parser.CHUNK_SIZE = 5
+        self.parser.parse_bib(io.BytesIO(bib))
+
+        self.assertEqual([e.key for e in self.parser.entries],
+                         ["key1", "key2"])
+
+    def test_parse_unclosed(self):
+        with self.assertRaises(IndexError):
+            self.parser.parse_bib(io.StringIO("@article{key, title = {x}"))
@@ -0,0 +1,113 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic import snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.filename = os.path.join(self.tmp, "test.bib")
+        shutil.copy(os.path.join(os.path.dirname(__file__),
+                                 "fixtures", "test_bib.bib"), self.filename)
+
+        self.expected = BibTexMagic()
+        self.expected.parse_bib(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def parse(self):
+        parser = BibTexMagic()
+        parser.parse_bib(self.filename, cache_dir=self.cache_dir)
+        return parser
+
+    def snapshot_path(self):
+        return snapshot.Snapshot(self.cache_dir, self.filename).path
+
+    def test_warm_load(self):
+        cold = self.parse()
+        self.assertTrue(os.path.exists(self.snapshot_path()))
+
+        with mock.patch("bibtexmagic.bibtexmagic.bibtexmagic."
+                        "BibTexEntry") as entry_class:
+            warm = self.parse()
+            entry_class.assert_not_called()
+
+        self.assertEqual(cold.to_bibtex(), self.expected.to_bibtex())
+        self.assertEqual(warm.to_bibtex(), self.expected.to_bibtex())
+        self.assertEqual([e.to_dict() for e in warm.entries],
+                         [e.to_dict() for e in self.expected.entries])
+        self.assertIs(warm["article_key"], warm.entries[1])
+        self.assertIs(warm.entries[0].get_field("author").value[0],
+                      BibTexMagic.NAMES.get(("Last", "", "First")))
+
+    def test_stale_snapshot(self):
+        self.parse()
+
+        with open(self.filename, "a") as bibfile:
+            bibfile.write("\n@article{new_key, title = {New}}\n")
+
+        self.assertIn("new_key", self.parse())
+
+    def test_touched_file(self):
+        self.parse()
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 10**9))
+
+        loaded = snapshot.Snapshot(self.cache_dir, self.filename).load()
+
+        self.assertEqual([e.key for e in loaded],
+                         [e.key for e in self.expected.entries])
+
+    def test_corrupt_snapshot(self):
+        self.parse()
+        path = self.snapshot_path()
+        with open(path, "rb") as snapshot_file:
+            data = snapshot_file.read()
+
+        for corrupt in (data[:10], data[:-5], data[:-1] + b"x", b""):
+            with open(path, "wb") as snapshot_file:
+                snapshot_file.write(corrupt)
+
+            self.assertIsNone(
+                snapshot.Snapshot(self.cache_dir, self.filename).load())
+            self.assertEqual(self.parse().to_bibtex(),
+                             self.expected.to_bibtex())
+
+            # The snapshot has been rebuilt.
+            with open(path, "rb") as snapshot_file:
+                self.assertEqual(snapshot_file.read(), data)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs user ids")
+    def test_untrusted_snapshot(self):
+        self.parse()
+        path = self.snapshot_path()
+
+        os.chmod(path, 0o666)
+        self.assertIsNone(
+            snapshot.Snapshot(self.cache_dir, self.filename).load())
+
+        os.chmod(path, 0o600)
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(
+                snapshot.Snapshot(self.cache_dir, self.filename).load())
+
+        self.assertIsNotNone(
+            snapshot.Snapshot(self.cache_dir, self.filename).load())
+
+    def test_buffer(self):
+        with self.assertRaises(ValueError):
+            BibTexMagic().parse_bib(io.StringIO(""),
+                                    cache_dir=self.cache_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic import sort
+
+
+BIB = ("@article{e1, author = {\\'{E}mile Zola}, title = {Zebra},\n"
+       "  year = {1900}}\n"
+       "@article{e2, author = {Ada Lovelace}, title = {b Title},\n"
+       "  year = {1843}}\n"
+       "@article{e3, author = {Lovelace, Ada}, title = {\\'{A} title},\n"
+       "  year = {1843}}\n"
+       "@article{e4, author = {Emile Zola}, year = {1890}}\n"
+       "@article{e5, author = {Zoe Ebert}, year = {in press}}\n"
+       "@book{e6, title = {No Author}}\n")
+
+
+class TestSort(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.parser.parse_bib(io.StringIO(BIB))
+
+    def keys(self, entries):
+        return [e.key for e in entries]
+
+    def test_sort(self):
+        self.parser.sort()
+        self.assertEqual(self.keys(self.parser.entries),
+                         ["e5", "e3", "e2", "e4", "e1", "e6"])
+
+        # Missing fields and non-numeric years stay last.
+        self.parser.sort("year", reverse=True)
+        self.assertEqual(self.keys(self.parser.entries),
+                         ["e1", "e4", "e3", "e2", "e5", "e6"])
+
+        self.parser.sort(["author", "title"], reverse=True)
+        self.assertEqual(self.keys(self.parser.entries),
+                         ["e1", "e4", "e2", "e3", "e5", "e6"])
+
+        self.parser.sort(["entry_type", "title"])
+        self.assertEqual(self.keys(self.parser.entries),
+                         ["e3", "e2", "e1", "e4", "e5", "e6"])
+
+    def test_external_sort(self):
+        by = ("author", "year")
+        for reverse in (False, True):
+            expected = sorted(self.parser.entries, reverse=reverse,
+                              key=lambda e: sort.sort_key(e, by, reverse))
+            for run_size in (1, 2, 100):
+                result = sort.external_sort(iter(self.parser.entries), by,
+                                            reverse, run_size)
+                self.assertEqual(self.keys(result), self.keys(expected))
+
+            # Runs bounded by the sizes of the entries.
+            for run_bytes in (1, 50, 10000):
+                sized = ((e, 40) for e in self.parser.entries)
+                result = sort.external_sort(sized, by, reverse, 100,
+                                            run_bytes)
+                self.assertEqual(self.keys(result), self.keys(expected))
+
+    def test_sort_file(self):
+        self.parser.SORT_RUN_SIZE = 2
+        out = io.StringIO()
+        self.parser.sort_file(io.StringIO(BIB), out, "key", reverse=True)
+
+        self.parser.sort("key", reverse=True)
+        self.assertEqual(out.getvalue(), self.parser.to_bibtex())
+
+        self.parser.SORT_RUN_SIZE = 100
+        self.parser.SORT_RUN_BYTES = 100
+        out = io.StringIO()
+        self.parser.sort_file(io.StringIO(BIB), out, "key", reverse=True)
+        self.assertEqual(out.getvalue(), self.parser.to_bibtex())
+
+
+if __name__ == "__main__":
+    unittest.main()
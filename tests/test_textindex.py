@@ -0,0 +1,88 @@
+import io
+import os
+import tempfile
+import unittest
+
+from bibtexmagic.bibtexmagic.bibtexmagic import BibTexMagic
+from bibtexmagic.bibtexmagic.entry import BibTexEntry
+from bibtexmagic.bibtexmagic.textindex import TextIndex
+
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.parser = BibTexMagic()
+        self.parser.parse_bib(io.StringIO(
+            "@article{a1, author = {Paul Erd\\H{o}s},\n"
+            "  title = {On {R}andom Graphs}, journal = {Publ. Math.}}\n"
+            "@article{a2, author = {R\\'{e}nyi, Alfr\\'{e}d},\n"
+            "  title = {On the evolution of random graphs}}\n"
+            "@book{b1, author = {M{\\\"u}ller, Hans},\n"
+            "  title = {Stochastic Processes}, year = {1953}}\n"))
+
+    def keys(self, entries):
+        return [e.key for e in entries]
+
+    def test_search(self):
+        self.assertEqual(self.keys(self.parser.search("RANDOM graphs")),
+                         ["a1", "a2"])
+        self.assertEqual(self.keys(self.parser.search("erdos")), ["a1"])
+        self.assertEqual(self.keys(self.parser.search("Müller")), ["b1"])
+        self.assertEqual(self.keys(self.parser.search("Erdős random")),
+                         ["a1"])
+        self.assertEqual(self.keys(self.parser.search("renyi erdos")), [])
+        self.assertEqual(
+            self.keys(self.parser.search(["renyi", "erdos"], mode="or")),
+            ["a1", "a2"])
+        self.assertEqual(self.keys(self.parser.search("1953")), [])
+        self.assertEqual(self.parser.search(""), [])
+
+        with self.assertRaises(ValueError):
+            self.parser.search("x", mode="xor")
+
+    def test_prefix(self):
+        self.assertEqual(self.keys(self.parser.search("stoch")), [])
+        self.assertEqual(
+            self.keys(self.parser.search("stoch proc", prefix=True)),
+            ["b1"])
+        self.assertEqual(self.keys(self.parser.search("ev", prefix=True)),
+                         ["a2"])
+
+    def test_incremental(self):
+        self.parser.build_text_index()
+
+        self.parser.add_entry(BibTexEntry(
+            "article{a3, title = {Random walks}}"))
+        self.parser.remove_entry("a1")
+
+        self.assertEqual(self.keys(self.parser.search("random")),
+                         ["a2", "a3"])
+        self.assertEqual(self.parser.search("erdos"), [])
+        self.assertNotIn("erdos", self.parser.text_index._postings)
+
+        # The vocabulary is sorted again by the next prefix search only.
+        self.assertIsNone(self.parser.text_index._vocabulary)
+        self.assertEqual(self.keys(self.parser.search("wal", prefix=True)),
+                         ["a3"])
+        self.assertNotIn("erdos", self.parser.text_index._vocabulary)
+        self.assertEqual(self.parser.text_index._vocabulary,
+                         sorted(self.parser.text_index._postings))
+
+    def test_save(self):
+        self.parser.build_text_index()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index")
+            self.parser.text_index.save(path)
+            loaded = TextIndex.load(path)
+
+            with open(path, "wb") as index_file:
+                index_file.write(b"\x80\x04K\x00.")
+            with self.assertRaises(ValueError):
+                TextIndex.load(path)
+
+        self.assertEqual(loaded.search("graph", prefix=True), ["a1", "a2"])
+        self.assertEqual(len(loaded), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,3 +33,19 @@ class LatexToUnicodeTest(unittest.TestCase):
         uni = converter.uni_to_lat(macros_uni)
 
         self.assertEqual(macros, uni)
+
+    def test_longest_match(self):
+        converter = LatexToUni()
+
+        self.assertEqual(converter.lat_to_uni(r"\i\iota\Lambda\L"),
+                         "ıιΛŁ")
+        self.assertEqual(converter.lat_to_uni(r"x{^2} \oe\o"),
+                         "x² œø")
+
+    def test_no_macros(self):
+        converter = LatexToUni()
+        plain = "A plain title {with} braces"
+
+        self.assertEqual(converter.lat_to_uni(plain), plain)
+        self.assertEqual(converter.uni_to_lat(plain), plain)
+        self.assertEqual(converter.uni_to_lat(r"\i and \^"), r"\i and \^")
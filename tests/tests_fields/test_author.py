@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from bibtexmagic.bibtexmagic.fields import author, field
+from bibtexmagic.bibtexmagic.fields import author, field, person
 
 
 class TestTitleField(unittest.TestCase):
@@ -24,12 +25,12 @@ class TestTitleField(unittest.TestCase):
         ]
 
         expected = [
-            ["Waits", "", "Tom"],
-            ["McTestface", "", "Facy Test"],
-            ["von Jungingen", "", "Ulrich"],
-            ["de la Last", "", "First"],
-            ["von Last", "Jr", "First"],
-            ["von Last", "Jr", "First1 First2"]
+            ("Waits", "", "Tom"),
+            ("McTestface", "", "Facy Test"),
+            ("von Jungingen", "", "Ulrich"),
+            ("de la Last", "", "First"),
+            ("von Last", "Jr", "First"),
+            ("von Last", "Jr", "First1 First2")
         ]
 
         for raw, parsed in zip(raw, expected):
@@ -37,8 +38,8 @@ class TestTitleField(unittest.TestCase):
 
     def test_parse_field_unicode(self):
         raw = "First La\\\'{s}t"
-        parsed_no_uni = [["La\\\'{s}t", "", "First"]]
-        parsed_uni = [["La\u015Bt", "", "First"]]
+        parsed_no_uni = (("La\\\'{s}t", "", "First"),)
+        parsed_uni = (("La\u015Bt", "", "First"),)
 
         # Should not parse unicode
         f = field.BibTexField.create_field(
@@ -46,6 +47,39 @@ class TestTitleField(unittest.TestCase):
 
         self.assertEqual(f.value, parsed_uni)
 
+    def test_shared_persons(self):
+        f1 = author.AuthorBibTexField("First Last and Other One")
+        f2 = field.BibTexField.create_field("editor", "Last, First")
+
+        self.assertIsInstance(f2, author.EditorBibTexField)
+        self.assertIs(f1.value[0], f2.value[0])
+        self.assertIsInstance(f1.value[0], person.Person)
+        self.assertEqual(f1.value[0].last, "Last")
+        self.assertIs(person.NAMES.get(("Last", "", "First")), f1.value[0])
+        self.assertEqual(f2.to_bibtex(), "editor = {Last, First}")
+
+    def test_unpickled_persons_shared(self):
+        f1 = author.AuthorBibTexField("First Last")
+
+        f2 = pickle.loads(pickle.dumps(f1))
+
+        self.assertIs(f2.value[0], f1.value[0])
+
+    def test_name_table_bounded(self):
+        table = person.NameTable(maxsize=4)
+
+        def parse(raw):
+            return ("Last", "", raw.split()[0])
+
+        for i in range(10):
+            table.person(f"First{i} Last", parse)
+
+        self.assertLessEqual(len(table), 4)
+        self.assertLessEqual(len(table._by_raw), 4)
+        self.assertIs(table.person("First9 Last", parse),
+                      table.get(("Last", "", "First9")))
+        self.assertIsNone(table.get(("Last", "", "First0")))
+
     def test_parse_field_multiple(self):
         authors = ' and '.join(['a', 'b', 'c', 'd'])
 
@@ -0,0 +1,73 @@
+import unittest
+
+from bibtexmagic.bibtexmagic.fields import field
+
+
+class DoiBibTexField(field.BibTexField):
+    def __init__(self, field_raw, lazy=False):
+        super().__init__("doi", field_raw, lazy)
+
+    def parse_field(self, field_raw):
+        return field_raw.strip().lower()
+
+
+class IsbnBibTexField(field.BibTexField):
+    def __init__(self, field_raw):
+        super().__init__("isbn", field_raw)
+
+
+class TestField(unittest.TestCase):
+    def test_create_generic_field(self):
+        f = field.BibTexField.create_field("Journal", "Test J.")
+
+        self.assertIs(type(f), field.BibTexField)
+        self.assertEqual(f.name, "journal")
+        self.assertEqual(f.value, "Test J.")
+
+    def test_create_unsupported_field(self):
+        with self.assertRaises(UserWarning):
+            field.BibTexField.create_field("nonsense", "value")
+
+    def test_register_field(self):
+        allowed = list(field.BibTexField._ALLOWED_FIELDS)
+        field_classes = dict(field.BibTexField._field_classes())
+
+        def restore():
+            field.BibTexField._ALLOWED_FIELDS[:] = allowed
+            field.BibTexField._FIELD_CLASSES.clear()
+            field.BibTexField._FIELD_CLASSES.update(field_classes)
+
+        self.addCleanup(restore)
+        field.BibTexField.register_field("doi", DoiBibTexField)
+
+        f = field.BibTexField.create_field("DOI", " 10.1000/ABC ")
+
+        self.assertTrue(isinstance(f, DoiBibTexField))
+        self.assertEqual(f.value, "10.1000/abc")
+
+    def test_register_legacy_field(self):
+        self.test_register_field()
+        field.BibTexField.register_field("isbn", IsbnBibTexField)
+
+        f = field.BibTexField.create_field("isbn", "0-123", True)
+
+        self.assertIsInstance(f, IsbnBibTexField)
+        self.assertEqual(f.value, "0-123")
+
+    def test_register_field_restored(self):
+        self.test_register_field()
+        self.doCleanups()
+
+        with self.assertRaises(UserWarning):
+            field.BibTexField.create_field("doi", "10.1000/abc")
+
+    def test_lazy_field(self):
+        f = field.BibTexField.create_field("title", "lazy {TITLE}", True)
+
+        self.assertEqual(f._raw, "lazy {TITLE}")
+        self.assertEqual(f.value, "Lazy TITLE")
+        self.assertIsNone(f._raw)
+
+
+if __name__ == "__main__":
+    unittest.main()